@@ -3,15 +3,146 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
+import voluptuous as vol
 
-from .const import DOMAIN, PLATFORMS, DEFAULT_SCAN_INTERVAL
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_ENTITY_ID,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_FIRMWARE,
+    CONF_FIRMWARE_PATH,
+    CONF_MARGIN,
+    CONF_MAX_PARALLEL,
+    CONF_POWER_BUDGET,
+    CONF_TARGET_TEMP,
+    CONF_TARGET_VR_TEMP,
+    CONF_THERMAL_CONTROL,
+    CONF_THERMAL_INTERVAL,
+    CONF_VERSION,
+    CONF_WWW_PATH,
+    DATA_ANALYTICS,
+    DATA_FREQUENCY_LIMITS,
+    DATA_PROFILER,
+    DEFAULT_OTA_MAX_PARALLEL,
+    DEFAULT_OTA_TIMEOUT,
+    DEFAULT_POWER_BUDGET_MARGIN,
+    DEFAULT_TARGET_TEMP,
+    DEFAULT_TARGET_VR_TEMP,
+    DEFAULT_THERMAL_INTERVAL,
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+)
+from .analytics import BitaxeFleetAnalytics
 from .coordinator import BitaxeApiClient, BitaxeDataUpdateCoordinator
+from .energy import energy_store
+from .firmware import BitaxeFirmwareManager, FirmwareImage
+from .frequency import async_load_frequency_limits, frequency_store
+from .history import history_path, remove_history
+from .metrics import BitaxeMetricsView
+from .pool import pool_store
+from .power_budget import BitaxePowerBudgetController
+from .profiling import BitaxeProfiler
+from .resolver import BitaxeHostResolver
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
+from .thermal import BitaxeThermalController
 
 _LOGGER = logging.getLogger(__name__)
 
+POWER_BUDGET_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_MARGIN, default=DEFAULT_POWER_BUDGET_MARGIN): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+FIRMWARE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_VERSION): cv.string,
+        vol.Required(CONF_FIRMWARE_PATH): cv.isfile,
+        vol.Optional(CONF_WWW_PATH): cv.isfile,
+        vol.Optional(CONF_MAX_PARALLEL, default=DEFAULT_OTA_MAX_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(CONF_TIMEOUT, default=DEFAULT_OTA_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=60)
+        ),
+    }
+)
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_POWER_BUDGET): POWER_BUDGET_SCHEMA,
+                vol.Optional(CONF_FIRMWARE): FIRMWARE_SCHEMA,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Bitaxe integration."""
+    hass.data.setdefault(DOMAIN, {})[DATA_PROFILER] = BitaxeProfiler()
+    await async_setup_services(hass)
+    async_register_websocket_commands(hass)
+    hass.http.register_view(BitaxeMetricsView())
+
+    analytics = BitaxeFleetAnalytics(hass)
+    analytics.async_start()
+    hass.data[DOMAIN][DATA_ANALYTICS] = analytics
+
+    @callback
+    def _async_stop_analytics(event: Event) -> None:
+        analytics.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_analytics)
+
+    domain_config = config.get(DOMAIN, {})
+    if CONF_FIRMWARE in domain_config:
+        firmware_config = domain_config[CONF_FIRMWARE]
+        hass.data[DOMAIN][CONF_FIRMWARE] = BitaxeFirmwareManager(
+            hass,
+            FirmwareImage(
+                firmware_config[CONF_VERSION],
+                firmware_config[CONF_FIRMWARE_PATH],
+                firmware_config.get(CONF_WWW_PATH),
+            ),
+            firmware_config[CONF_MAX_PARALLEL],
+            firmware_config[CONF_TIMEOUT],
+        )
+
+    if CONF_POWER_BUDGET in domain_config:
+        budget_config = domain_config[CONF_POWER_BUDGET]
+        controller = BitaxePowerBudgetController(
+            hass, budget_config[CONF_ENTITY_ID], budget_config[CONF_MARGIN]
+        )
+        controller.async_start()
+        hass.data[DOMAIN][CONF_POWER_BUDGET] = controller
+
+        @callback
+        def _async_stop_controller(event: Event) -> None:
+            controller.async_stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_controller)
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Bitaxe from a config entry."""
@@ -21,16 +152,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     name = entry.data["name"]
 
     api = BitaxeApiClient(host, port)
-    coordinator = BitaxeDataUpdateCoordinator(hass, api, name, scan_interval)
+    coordinator = BitaxeDataUpdateCoordinator(
+        hass, api, name, scan_interval, entry.options
+    )
 
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
 
+    # Restore the frequency set by the user before a controller sees the device
+    if entry.unique_id is not None:
+        await async_load_frequency_limits(hass, entry.unique_id)
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     # Set up platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _async_remove_stale_entities(hass, entry, coordinator)
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+
+    resolver = BitaxeHostResolver(hass, entry, coordinator)
+    resolver.async_start()
+    entry.async_on_unload(resolver.async_stop)
+
+    if entry.options.get(CONF_THERMAL_CONTROL, False):
+        thermal = BitaxeThermalController(
+            hass,
+            coordinator,
+            entry.options.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
+            entry.options.get(CONF_TARGET_VR_TEMP, DEFAULT_TARGET_VR_TEMP),
+            entry.options.get(CONF_THERMAL_INTERVAL, DEFAULT_THERMAL_INTERVAL),
+        )
+        thermal.async_start()
+        entry.async_on_unload(thermal.async_stop)
 
     # Reload entry when options are updated
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -38,9 +191,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+@callback
+def _async_remove_stale_entities(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: BitaxeDataUpdateCoordinator
+) -> None:
+    """Remove entities of platforms the entry no longer forwards.
+
+    Switching a device to monitoring only would otherwise leave its control
+    entities behind as unavailable.
+    """
+    registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity.domain not in coordinator.platforms:
+            registry.async_remove(entity.entity_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
+    )
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
@@ -48,7 +219,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted data of a deleted config entry."""
+    if entry.unique_id is not None:
+        await energy_store(hass, entry.unique_id).async_remove()
+        hass.data.get(DOMAIN, {}).get(DATA_FREQUENCY_LIMITS, {}).pop(
+            entry.unique_id, None
+        )
+        await frequency_store(hass, entry.unique_id).async_remove()
+        await pool_store(hass, entry.unique_id).async_remove()
+        await hass.async_add_executor_job(
+            remove_history, history_path(hass, entry.unique_id)
+        )
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry when options are updated."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
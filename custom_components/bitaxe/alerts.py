@@ -0,0 +1,106 @@
+"""Threshold alerts for the Bitaxe integration."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .const import (
+    ALERT_FAN_STALL,
+    ALERT_HASHRATE_COLLAPSE,
+    ALERT_LOW_HEAP,
+    ALERT_OVERHEAT,
+    ALERT_REJECT_SPIKE,
+    CONF_HASHRATE_DROP,
+    CONF_MIN_FREE_HEAP,
+    CONF_OVERHEAT_TEMP,
+    CONF_REJECT_RATE,
+    DEFAULT_HASHRATE_DROP,
+    DEFAULT_MIN_FREE_HEAP,
+    DEFAULT_OVERHEAT_TEMP,
+    DEFAULT_REJECT_RATE,
+    FAN_STALL_RPM,
+    HYSTERESIS_FREE_HEAP,
+    HYSTERESIS_HASHRATE,
+    HYSTERESIS_REJECT_RATE,
+    HYSTERESIS_TEMP,
+)
+
+
+class ThresholdMonitor:
+    """Track alert conditions and report only their transitions.
+
+    Each alert becomes active when its threshold is crossed and only clears
+    once the value has moved back past the threshold by a hysteresis margin,
+    so a reading hovering around the limit does not produce a flood of
+    events.
+    """
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Initialize the monitor from the entry options."""
+        self.overheat_temp = options.get(CONF_OVERHEAT_TEMP, DEFAULT_OVERHEAT_TEMP)
+        self.hashrate_drop = options.get(CONF_HASHRATE_DROP, DEFAULT_HASHRATE_DROP)
+        self.reject_rate = options.get(CONF_REJECT_RATE, DEFAULT_REJECT_RATE)
+        self.min_free_heap = options.get(CONF_MIN_FREE_HEAP, DEFAULT_MIN_FREE_HEAP)
+        self.active: dict[str, bool] = {}
+
+    def check(self, data: Mapping[str, Any]) -> list[tuple[str, bool, float]]:
+        """Return the (alert, active, value) transitions for a snapshot."""
+        transitions = []
+        for alert, value, triggered, cleared in self._conditions(data):
+            active = self.active.get(alert, False)
+            if not active and triggered:
+                self.active[alert] = True
+                transitions.append((alert, True, value))
+            elif active and cleared:
+                self.active[alert] = False
+                transitions.append((alert, False, value))
+        return transitions
+
+    def _conditions(
+        self, data: Mapping[str, Any]
+    ) -> Iterator[tuple[str, float, bool, bool]]:
+        """Yield (alert, value, triggered, cleared) for every evaluable alert."""
+        if (temp := data.get("temp")) is not None:
+            yield (
+                ALERT_OVERHEAT,
+                temp,
+                temp >= self.overheat_temp,
+                temp < self.overheat_temp - HYSTERESIS_TEMP,
+            )
+
+        hashrate = data.get("hashRate")
+        hashrate_1h = data.get("hashRate_1h")
+        if hashrate is not None and hashrate_1h:
+            percent = hashrate * 100 / hashrate_1h
+            yield (
+                ALERT_HASHRATE_COLLAPSE,
+                round(percent, 1),
+                percent < self.hashrate_drop,
+                percent >= self.hashrate_drop + HYSTERESIS_HASHRATE,
+            )
+
+        if (reject_rate := data.get("rejectRate_5m")) is not None:
+            yield (
+                ALERT_REJECT_SPIKE,
+                reject_rate,
+                reject_rate >= self.reject_rate,
+                reject_rate < self.reject_rate - HYSTERESIS_REJECT_RATE,
+            )
+
+        fanrpm = data.get("fanrpm")
+        fanspeed = data.get("fanspeed")
+        if fanrpm is not None and fanspeed is not None:
+            yield (
+                ALERT_FAN_STALL,
+                fanrpm,
+                fanspeed > 0 and fanrpm < FAN_STALL_RPM,
+                fanspeed == 0 or fanrpm >= 2 * FAN_STALL_RPM,
+            )
+
+        if (free_heap := data.get("freeHeap")) is not None:
+            yield (
+                ALERT_LOW_HEAP,
+                free_heap,
+                free_heap < self.min_free_heap,
+                free_heap >= self.min_free_heap * (1 + HYSTERESIS_FREE_HEAP),
+            )
@@ -0,0 +1,174 @@
+"""Fleet anomaly detection for the Bitaxe integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+import warnings
+
+import numpy as np
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+
+from .const import (
+    ANALYTICS_MAD_FLOOR,
+    ANALYTICS_METRICS,
+    ANALYTICS_MIN_PEERS,
+    ANALYTICS_OUTLIER_SCORE,
+    DEFAULT_SCAN_INTERVAL,
+    SIGNAL_ANALYTICS_UPDATE,
+    SIGNAL_COORDINATOR_UPDATE,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+from .fleet import async_get_coordinators
+
+_LOGGER = logging.getLogger(__name__)
+
+# Direction in which each metric is worse: lower hashrate per MHz, higher J/TH,
+# temperature and reject rate
+_WORSE = np.array([-1.0, 1.0, 1.0, 1.0])
+# Scales the median absolute deviation to the standard deviation of a normal
+# distribution, so scores read like ordinary z-scores
+_MAD_SCALE = 1.4826
+
+
+@dataclass
+class DeviceAnomaly:
+    """Anomaly score of a device against its peers."""
+
+    score: float | None
+    peers: int
+    z_scores: dict[str, float | None] = field(default_factory=dict)
+
+    @property
+    def outlier(self) -> bool:
+        """Return True if the device stands out from its peers."""
+        return self.score is not None and self.score >= ANALYTICS_OUTLIER_SCORE
+
+
+def _metrics(data: dict[str, Any]) -> list[float]:
+    """Return the compared metrics of a snapshot, NaN where unavailable."""
+    hashrate = data.get("hashRate_1h") or data.get("hashRate_10m") or data.get("hashRate")
+    frequency = data.get("frequency")
+    values = (
+        hashrate / frequency if hashrate and frequency else None,
+        data.get("efficiency"),
+        data.get("temp"),
+        data.get("rejectRate_1h"),
+    )
+    return [np.nan if value is None else float(value) for value in values]
+
+
+def score_fleet(
+    models: list[str], values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score every device against the devices of the same ASIC model.
+
+    ``values`` holds one row per device and one column per metric. Returns
+    the robust z-scores (oriented so that positive is worse), the anomaly
+    score (the worst z-score, NaN without enough peers) and the number of
+    peers of every device.
+    """
+    z_scores = np.full(values.shape, np.nan)
+    peers = np.zeros(len(models), dtype=int)
+    groups, group_index = np.unique(np.asarray(models), return_inverse=True)
+
+    for group in range(len(groups)):
+        rows = group_index == group
+        count = int(rows.sum())
+        peers[rows] = count
+        if count < ANALYTICS_MIN_PEERS:
+            continue
+        group_values = values[rows]
+        with warnings.catch_warnings():
+            # A metric no device of the model reports has an all-NaN median
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nanmedian(group_values, axis=0)
+            mad = np.nanmedian(np.abs(group_values - median), axis=0) * _MAD_SCALE
+        mad = np.fmax(mad, np.abs(median) * ANALYTICS_MAD_FLOOR)
+        mad[mad == 0] = np.nan
+        z_scores[rows] = (group_values - median) / mad * _WORSE
+
+    scores = np.max(
+        np.where(np.isnan(z_scores), -np.inf, np.maximum(z_scores, 0)), axis=1
+    )
+    scores[np.isinf(scores)] = np.nan
+    return z_scores, scores, peers
+
+
+class BitaxeFleetAnalytics:
+    """Compare every device with its peers once per fleet poll cycle.
+
+    Device polls are batched with a debouncer, so the pass runs at most
+    once per scan interval however large the fleet is. Each pass is a
+    handful of NumPy operations per ASIC model, so its cost barely grows
+    with the number of devices.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the analytics."""
+        self.hass = hass
+        self.anomalies: dict[str, DeviceAnomaly] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=DEFAULT_SCAN_INTERVAL,
+            immediate=False,
+            function=self._async_evaluate,
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Start reacting to device polls."""
+        self._unsub = async_dispatcher_connect(
+            self.hass, SIGNAL_COORDINATOR_UPDATE, self._async_coordinator_updated
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the analytics."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._debouncer.async_cancel()
+
+    @callback
+    def _async_coordinator_updated(self, coordinator: BitaxeDataUpdateCoordinator) -> None:
+        """Handle a completed device poll."""
+        self.hass.async_create_task(self._debouncer.async_call())
+
+    async def _async_evaluate(self) -> None:
+        """Score the fleet and notify the anomaly sensors."""
+        coordinators = [
+            coordinator
+            for coordinator in async_get_coordinators(self.hass)
+            if not coordinator.failure_count and coordinator.data
+        ]
+        if not coordinators:
+            self.anomalies = {}
+            return
+
+        models = [str(c.data.get("ASICModel", "Unknown")) for c in coordinators]
+        values = np.array([_metrics(c.data) for c in coordinators], dtype=float)
+        z_scores, scores, peers = score_fleet(models, values)
+
+        self.anomalies = {
+            coordinator.data["macAddr"]: DeviceAnomaly(
+                None if np.isnan(scores[row]) else round(float(scores[row]), 2),
+                int(peers[row]),
+                {
+                    metric: None
+                    if np.isnan(z_scores[row, column])
+                    else round(float(z_scores[row, column]), 2)
+                    for column, metric in enumerate(ANALYTICS_METRICS)
+                },
+            )
+            for row, coordinator in enumerate(coordinators)
+        }
+        async_dispatcher_send(self.hass, SIGNAL_ANALYTICS_UPDATE)
@@ -0,0 +1,71 @@
+"""Capture of Bitaxe device payloads."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+import gzip
+import threading
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_dumps
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+
+def capture_path(hass: HomeAssistant, mac: str) -> str:
+    """Return the path of a new capture file for a device."""
+    return hass.config.path(
+        f"bitaxe_capture_{mac.replace(':', '').lower()}_"
+        f"{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+    )
+
+
+class CaptureWriter:
+    """Append the responses of every poll to a gzip-compressed JSONL file.
+
+    Each line holds one poll: its Unix timestamp, the decoded response of
+    every endpoint that answered, keyed by path, and the error of every
+    endpoint that did not. The file is opened, written and closed from the
+    executor, so writes and closing are serialized with a lock.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open the capture file for appending."""
+        self.path = path
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def encode(
+        timestamp: float,
+        responses: Mapping[str, Any],
+        errors: Mapping[str, BaseException],
+    ) -> str:
+        """Return the line of a poll; called in the event loop."""
+        return json_dumps(
+            {
+                "t": timestamp,
+                "responses": responses,
+                "errors": {
+                    path: [type(err).__name__, str(err)] for path, err in errors.items()
+                },
+            }
+        )
+
+    def write(self, line: str) -> None:
+        """Append an encoded poll, unless the capture was closed meanwhile."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+    def close(self) -> None:
+        """Flush and close the capture file."""
+        with self._lock:
+            self._file.close()
+
+
+def read_capture(path: str) -> list[dict[str, Any]]:
+    """Return the polls of a capture file, oldest first."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json_loads(line) for line in file if line.strip()]
+
@@ -11,7 +11,34 @@ from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTER
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN, DEFAULT_PORT, DEFAULT_SCAN_INTERVAL
+from .const import (
+    CONF_FAILOVER_ERROR_RATE,
+    CONF_FAILOVER_REJECT_RATE,
+    CONF_FAILOVER_WINDOW,
+    CONF_HASHRATE_DROP,
+    CONF_MIN_FREE_HEAP,
+    CONF_MONITORING_ONLY,
+    CONF_OVERHEAT_TEMP,
+    CONF_POOL_FAILOVER,
+    CONF_REJECT_RATE,
+    CONF_TARGET_TEMP,
+    CONF_TARGET_VR_TEMP,
+    CONF_THERMAL_CONTROL,
+    CONF_THERMAL_INTERVAL,
+    DOMAIN,
+    DEFAULT_FAILOVER_ERROR_RATE,
+    DEFAULT_FAILOVER_REJECT_RATE,
+    DEFAULT_FAILOVER_WINDOW,
+    DEFAULT_HASHRATE_DROP,
+    DEFAULT_MIN_FREE_HEAP,
+    DEFAULT_OVERHEAT_TEMP,
+    DEFAULT_PORT,
+    DEFAULT_REJECT_RATE,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TARGET_TEMP,
+    DEFAULT_TARGET_VR_TEMP,
+    DEFAULT_THERMAL_INTERVAL,
+)
 from .coordinator import BitaxeApiClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -57,7 +84,10 @@ class BitaxeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 info = await validate_input(self.hass, user_input)
-                
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "cannot_connect"
+            else:
                 # Store for next step
                 self._host = user_input[CONF_HOST]
                 self._mac = info["mac"]
@@ -69,16 +99,27 @@ class BitaxeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
                 return await self.async_step_config()
 
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "cannot_connect"
-
         return self.async_show_form(
             step_id="user",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
 
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a host validated by the import_hosts service."""
+        await self.async_set_unique_id(import_data["mac"])
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=import_data[CONF_NAME],
+            data={
+                CONF_HOST: import_data[CONF_HOST],
+                CONF_NAME: import_data[CONF_NAME],
+                CONF_PORT: import_data[CONF_PORT],
+            },
+            options={CONF_SCAN_INTERVAL: import_data[CONF_SCAN_INTERVAL]},
+        )
+
     async def async_step_config(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -153,6 +194,84 @@ class BitaxeOptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(
+                        CONF_MONITORING_ONLY,
+                        default=self.config_entry.options.get(
+                            CONF_MONITORING_ONLY, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_THERMAL_CONTROL,
+                        default=self.config_entry.options.get(
+                            CONF_THERMAL_CONTROL, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TARGET_TEMP,
+                        default=self.config_entry.options.get(
+                            CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=90)),
+                    vol.Optional(
+                        CONF_TARGET_VR_TEMP,
+                        default=self.config_entry.options.get(
+                            CONF_TARGET_VR_TEMP, DEFAULT_TARGET_VR_TEMP
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=100)),
+                    vol.Optional(
+                        CONF_THERMAL_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_THERMAL_INTERVAL, DEFAULT_THERMAL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Optional(
+                        CONF_OVERHEAT_TEMP,
+                        default=self.config_entry.options.get(
+                            CONF_OVERHEAT_TEMP, DEFAULT_OVERHEAT_TEMP
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=100)),
+                    vol.Optional(
+                        CONF_HASHRATE_DROP,
+                        default=self.config_entry.options.get(
+                            CONF_HASHRATE_DROP, DEFAULT_HASHRATE_DROP
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=99)),
+                    vol.Optional(
+                        CONF_REJECT_RATE,
+                        default=self.config_entry.options.get(
+                            CONF_REJECT_RATE, DEFAULT_REJECT_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+                    vol.Optional(
+                        CONF_MIN_FREE_HEAP,
+                        default=self.config_entry.options.get(
+                            CONF_MIN_FREE_HEAP, DEFAULT_MIN_FREE_HEAP
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_POOL_FAILOVER,
+                        default=self.config_entry.options.get(
+                            CONF_POOL_FAILOVER, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_FAILOVER_REJECT_RATE,
+                        default=self.config_entry.options.get(
+                            CONF_FAILOVER_REJECT_RATE, DEFAULT_FAILOVER_REJECT_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+                    vol.Optional(
+                        CONF_FAILOVER_ERROR_RATE,
+                        default=self.config_entry.options.get(
+                            CONF_FAILOVER_ERROR_RATE, DEFAULT_FAILOVER_ERROR_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+                    vol.Optional(
+                        CONF_FAILOVER_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_FAILOVER_WINDOW, DEFAULT_FAILOVER_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
                 }
             ),
         )
@@ -10,27 +10,245 @@ PLATFORMS = [
     Platform.SELECT,
     Platform.BUTTON,
     Platform.NUMBER,
+    Platform.UPDATE,
 ]
+# Read-only devices skip every platform that controls the device
+MONITORING_PLATFORMS = [Platform.SENSOR]
 
 # Configuration
 CONF_IP = "host"
 CONF_NAME = "name"
 CONF_PORT = "port"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_POWER_BUDGET = "power_budget"
+CONF_MARGIN = "margin"
+CONF_FIRMWARE = "firmware"
+CONF_FIRMWARE_PATH = "firmware_path"
+CONF_WWW_PATH = "www_path"
+CONF_VERSION = "version"
+CONF_MAX_PARALLEL = "max_parallel"
+CONF_OVERHEAT_TEMP = "overheat_temp"
+CONF_HASHRATE_DROP = "hashrate_drop"
+CONF_REJECT_RATE = "reject_rate"
+CONF_MIN_FREE_HEAP = "min_free_heap"
+CONF_THERMAL_CONTROL = "thermal_control"
+CONF_TARGET_TEMP = "target_temp"
+CONF_TARGET_VR_TEMP = "target_vr_temp"
+CONF_THERMAL_INTERVAL = "thermal_interval"
+CONF_MONITORING_ONLY = "monitoring_only"
+CONF_POOL_FAILOVER = "pool_failover"
+CONF_FAILOVER_REJECT_RATE = "failover_reject_rate"
+CONF_FAILOVER_ERROR_RATE = "failover_error_rate"
+CONF_FAILOVER_WINDOW = "failover_window"
 
 # Defaults
 DEFAULT_PORT = 80
 DEFAULT_SCAN_INTERVAL = 15  # seconds
 
+# Power budget controller
+DEFAULT_POWER_BUDGET_MARGIN = 10  # watts
+POWER_BUDGET_FREQUENCY_STEP = 25  # MHz
+POWER_BUDGET_MAX_STEPS = 2  # per device per evaluation
+POWER_BUDGET_MIN_FREQUENCY = 200  # MHz
+
+# Thermal controller
+DEFAULT_TARGET_TEMP = 60  # °C
+DEFAULT_TARGET_VR_TEMP = 70  # °C
+DEFAULT_THERMAL_INTERVAL = 3  # seconds
+THERMAL_KP = 4.0  # % fan per °C
+THERMAL_KI = 0.2  # % fan per °C·s
+THERMAL_KD = 2.0  # % fan per °C/s
+THERMAL_MIN_FAN = 20  # %
+THERMAL_FAN_MIN_DELTA = 2  # %
+THERMAL_FAN_WRITE_INTERVAL = 10  # seconds
+THERMAL_FREQUENCY_STEP = 25  # MHz
+THERMAL_FREQUENCY_WRITE_INTERVAL = 60  # seconds
+THERMAL_FREQUENCY_MARGIN = 2  # °C over target with the fan at 100%
+THERMAL_RESTORE_MARGIN = 5  # °C under target before restoring frequency
+THERMAL_MIN_FREQUENCY = 200  # MHz
+
+# Frequency limits shared by the power budget and thermal controllers
+DATA_FREQUENCY_LIMITS = "frequency_limits"
+FREQUENCY_WRITE_TIMEOUT = 60  # seconds for a written frequency to show up
+FREQUENCY_STORAGE_VERSION = 1
+FREQUENCY_SAVE_DELAY = 10  # seconds
+
+# Firmware updates
+DEFAULT_OTA_MAX_PARALLEL = 2
+DEFAULT_OTA_TIMEOUT = 600  # seconds
+DEFAULT_CANARY_SIZE = 1
+DEFAULT_ROLLOUT_BATCH_SIZE = 5
+OTA_UPLOAD_TIMEOUT = 300  # seconds
+OTA_CHUNK_SIZE = 64 * 1024  # bytes
+
+# Profiling
+DATA_PROFILER = "profiler"
+DEFAULT_PROFILE_DURATION = 60  # seconds
+DEFAULT_CAPTURE_DURATION = 300  # seconds
+PROFILE_CPROFILE_LINES = 40
+STAGE_QUEUE_WAIT = "queue_wait"
+STAGE_API_IO = "api_io"
+STAGE_JSON_DECODE = "json_decode"
+STAGE_COORDINATOR = "coordinator"
+STAGE_ENTITY_WRITE = "entity_write"
+STAGE_FLEET = "fleet_listeners"
+
+# Small cores per chip, for devices that don't report smallCoreCount
+ASIC_SMALL_CORES = {
+    "BM1397": 672,
+    "BM1366": 894,
+    "BM1368": 1276,
+    "BM1370": 2040,
+}
+
+# Request scheduling: the ESP32 web server only handles a few sockets at once
+REQUEST_MAX_PARALLEL = 2  # per device
+PRIORITY_USER = 0  # writes from entities and services
+PRIORITY_CONTROL = 1  # thermal control, power budget and pool failover
+PRIORITY_POLL = 2  # coordinator polls
+
+# Share rate windows, keyed by the suffix of the derived data keys
+SHARE_RATE_WINDOWS = {
+    "5m": 300,
+    "1h": 3600,
+}
+
+# Energy
+ENERGY_STORAGE_VERSION = 1
+ENERGY_SAVE_DELAY = 60  # seconds
+ENERGY_MAX_GAP = 300  # seconds, raised to ENERGY_MAX_GAP_POLLS scan intervals
+ENERGY_MAX_GAP_POLLS = 3
+
+# Sparkline history ring files
+HISTORY_VERSION = 1
+HISTORY_CAPACITY = 8640  # records, 24 hours at a 10 second scan interval
+HISTORY_FIELDS = ("hashRate", "temp", "vrTemp", "power")
+HISTORY_MAX_HOURS = 24
+HISTORY_MAX_POINTS = 1000
+DEFAULT_HISTORY_HOURS = 1
+DEFAULT_HISTORY_POINTS = 60
+
+# Fleet snapshots for the websocket API, in the order values are sent
+SNAPSHOT_FIELDS = (
+    "hashRate",
+    "hashRate_10m",
+    "expectedHashrate",
+    "hashrateEfficiency",
+    "temp",
+    "vrTemp",
+    "power",
+    "efficiency",
+    "frequency",
+    "coreVoltageActual",
+    "fanspeed",
+    "sharesAccepted",
+    "sharesRejected",
+    "rejectRate_5m",
+    "bestDiff",
+    "wifiRSSI",
+    "uptimeSeconds",
+    "pool",
+    "version",
+)
+SNAPSHOT_PUSH_DELAY = 1  # seconds to gather the polls of a fleet into one push
+
+# Bulk import
+IMPORT_MAX_PARALLEL = 16  # hosts validated at the same time
+
+# Prometheus metrics view
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Host re-resolution after a DHCP address change
+RESOLVE_AFTER_FAILURES = 3  # failed polls
+RESOLVE_INTERVAL = 300  # seconds between attempts
+RESOLVE_PROBE_TIMEOUT = 2  # seconds per probed address
+RESOLVE_MAX_PARALLEL = 32  # concurrent probes
+RESOLVE_SUBNET_PREFIX = 24
+
+# Threshold alerts, fired as bitaxe_<alert> events
+ALERT_OVERHEAT = "overheat"
+ALERT_HASHRATE_COLLAPSE = "hashrate_collapse"
+ALERT_REJECT_SPIKE = "reject_spike"
+ALERT_FAN_STALL = "fan_stall"
+ALERT_LOW_HEAP = "low_heap"
+DEFAULT_OVERHEAT_TEMP = 70  # °C
+DEFAULT_HASHRATE_DROP = 50  # % of the 1h average
+DEFAULT_REJECT_RATE = 5  # % over 5 minutes
+DEFAULT_MIN_FREE_HEAP = 50_000  # bytes
+FAN_STALL_RPM = 100
+HYSTERESIS_TEMP = 3  # °C
+HYSTERESIS_HASHRATE = 10  # percentage points
+HYSTERESIS_REJECT_RATE = 1  # percentage points
+HYSTERESIS_FREE_HEAP = 0.1  # fraction of the threshold
+
+# Pool failover
+POOL_PRIMARY = "primary"
+POOL_FALLBACK = "fallback"
+DEFAULT_FAILOVER_REJECT_RATE = 10  # % over 5 minutes
+DEFAULT_FAILOVER_ERROR_RATE = 10  # % as reported by the device
+DEFAULT_FAILOVER_WINDOW = 600  # seconds the pool must stay unhealthy
+POOL_SWITCH_COOLDOWN = 1800  # seconds between switches
+POOL_SWITCH_BACK_AFTER = 3600  # seconds on the fallback pool before retrying the primary
+POOL_STORAGE_VERSION = 1
+
+# Fleet anomaly detection
+DATA_ANALYTICS = "analytics"
+ANALYTICS_METRICS = ("hashrate_per_mhz", "efficiency", "temp", "reject_rate")
+ANALYTICS_MIN_PEERS = 3  # devices of the same ASIC model
+ANALYTICS_OUTLIER_SCORE = 3.5  # robust z-score
+ANALYTICS_MAD_FLOOR = 0.01  # fraction of the median, for peers that agree exactly
+
+# Dispatcher signals
+SIGNAL_COORDINATOR_UPDATE = f"{DOMAIN}_coordinator_update"
+SIGNAL_ANALYTICS_UPDATE = f"{DOMAIN}_analytics_update"
+SIGNAL_FIRMWARE_PROGRESS = f"{DOMAIN}_firmware_progress"
+
+# Refresh pipeline, keyed by the snapshot key each endpoint is merged under.
+# System info is fetched on every poll; ASIC info is also refreshed whenever
+# the firmware version changes.
+ENDPOINT_ASIC = "asic"
+ENDPOINT_INTERVALS = {
+    ENDPOINT_ASIC: 3600,  # seconds
+}
+
 # API Endpoints
 API_SYSTEM_INFO = "/api/system/info"
 API_SYSTEM_ASIC = "/api/system/asic"
 API_SYSTEM_RESTART = "/api/system/restart"
 API_SYSTEM_IDENTIFY = "/api/system/identify"
 API_SYSTEM_UPDATE = "/api/system"
+API_SYSTEM_OTA = "/api/system/OTA"
+API_SYSTEM_OTA_WWW = "/api/system/OTAWWW"
+
+# Services
+SERVICE_ROLLING_RESTART = "rolling_restart"
+SERVICE_FIRMWARE_ROLLOUT = "firmware_rollout"
+SERVICE_PROFILE = "profile"
+SERVICE_IMPORT_HOSTS = "import_hosts"
+SERVICE_CAPTURE = "capture"
+
+# Service attributes
+ATTR_DEVICE_ID = "device_id"
+ATTR_BATCH_SIZE = "batch_size"
+ATTR_TIMEOUT = "timeout"
+ATTR_MAX_FAILURES = "max_failures"
+ATTR_CANARY_SIZE = "canary_size"
+ATTR_DURATION = "duration"
+ATTR_CPROFILE = "cprofile"
+ATTR_HOSTS = "hosts"
+
+# Rolling restart defaults
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_RESTART_TIMEOUT = 300  # seconds
+DEFAULT_MAX_FAILURES = 1
+RECOVERY_POLL_INTERVAL = 10  # seconds
+RECOVERY_HASHRATE_RATIO = 0.8
 
 # Units
 GIGA_HASH_PER_SECOND = "GH/s"
+SHARES_PER_MINUTE = "shares/min"
+JOULES_PER_TERAHASH = "J/TH"
 
 # Overheat modes
 OVERHEAT_MODE_DISABLED = 0
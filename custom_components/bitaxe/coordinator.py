@@ -1,68 +1,201 @@
 """Coordinator for Bitaxe integration."""
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from dataclasses import dataclass
 from datetime import timedelta
 import logging
 import asyncio
+import os
+import time
 from typing import Any
 
 import aiohttp
 import async_timeout
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .const import (
     DOMAIN,
+    API_SYSTEM_ASIC,
     API_SYSTEM_INFO,
     API_SYSTEM_UPDATE,
     API_SYSTEM_RESTART,
     API_SYSTEM_IDENTIFY,
+    CONF_MONITORING_ONLY,
+    CONF_POOL_FAILOVER,
+    DATA_PROFILER,
     DEFAULT_DATA,
+    ENDPOINT_ASIC,
+    ENDPOINT_INTERVALS,
+    ENERGY_MAX_GAP_POLLS,
+    MONITORING_PLATFORMS,
+    OTA_CHUNK_SIZE,
+    OTA_UPLOAD_TIMEOUT,
+    PLATFORMS,
+    POOL_FALLBACK,
+    PRIORITY_CONTROL,
+    PRIORITY_POLL,
+    PRIORITY_USER,
+    SIGNAL_COORDINATOR_UPDATE,
+    STAGE_API_IO,
+    STAGE_COORDINATOR,
+    STAGE_ENTITY_WRITE,
+    STAGE_FLEET,
+    STAGE_JSON_DECODE,
+    STAGE_QUEUE_WAIT,
 )
+from .alerts import ThresholdMonitor
+from .capture import CaptureWriter
+from .energy import EnergyIntegrator
+from .hashrate import ExpectedHashrate
+from .history import HistoryRing, history_path
+from .pool import PoolFailover, active_pool
+from .profiling import BitaxeProfiler
+from .scheduler import RequestScheduler
+from .shares import ShareRateTracker
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class BitaxeApiClient:
-    """API client for Bitaxe device."""
+    """API client for Bitaxe device.
 
-    def __init__(self, host: str, port: int) -> None:
+    Every request goes through a per-device scheduler, so that polls,
+    control loops and user writes never open more than a couple of sockets
+    to the device at once, and user writes go first.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 10) -> None:
         """Initialize the API client."""
         self.host = host
         self.port = port
+        self.timeout = timeout
         self.base_url = f"http://{host}:{port}"
+        self.scheduler = RequestScheduler()
+        # Last (queue wait, request, decode) duration in seconds, keyed by
+        # endpoint path
+        self.timings: dict[str, tuple[float, float, float]] = {}
 
-    async def get_system_info(self) -> dict[str, Any]:
-        """Get system information from the device."""
-        url = f"{self.base_url}{API_SYSTEM_INFO}"
-        async with async_timeout.timeout(10):
+    async def _get_json(self, path: str, priority: int) -> Any:
+        """Fetch and decode a JSON endpoint, recording its timings."""
+        (body, io_time), waited = await self.scheduler.read(
+            path, priority, lambda: self._get(path)
+        )
+        start = time.perf_counter()
+        data = json_loads(body)
+        self.timings[path] = (waited, io_time, time.perf_counter() - start)
+        return data
+
+    async def _get(self, path: str) -> tuple[bytes, float]:
+        """Fetch the body of an endpoint and return it with the request time."""
+        url = f"{self.base_url}{path}"
+        start = time.perf_counter()
+        async with async_timeout.timeout(self.timeout):
             async with aiohttp.ClientSession() as session:
                 async with session.get(url) as response:
                     response.raise_for_status()
-                    return await response.json()
+                    body = await response.read()
+        return body, time.perf_counter() - start
+
+    async def _send(
+        self, method: str, path: str, priority: int, **kwargs: Any
+    ) -> None:
+        """Send a write request once the scheduler allows it."""
+
+        async def _request() -> None:
+            async with async_timeout.timeout(10):
+                async with aiohttp.ClientSession() as session:
+                    async with session.request(
+                        method, f"{self.base_url}{path}", **kwargs
+                    ) as response:
+                        response.raise_for_status()
+
+        _, waited = await self.scheduler.run(priority, _request)
+        self.timings[path] = (waited, 0.0, 0.0)
+
+    async def get_system_info(self, priority: int = PRIORITY_POLL) -> dict[str, Any]:
+        """Get system information from the device."""
+        return await self._get_json(API_SYSTEM_INFO, priority)
+
+    async def get_asic_info(self, priority: int = PRIORITY_POLL) -> dict[str, Any]:
+        """Get ASIC information from the device."""
+        return await self._get_json(API_SYSTEM_ASIC, priority)
 
-    async def update_settings(self, settings: dict[str, Any]) -> None:
+    async def update_settings(
+        self, settings: dict[str, Any], priority: int = PRIORITY_USER
+    ) -> None:
         """Update device settings."""
-        url = f"{self.base_url}{API_SYSTEM_UPDATE}"
-        async with async_timeout.timeout(10):
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(url, json=settings) as response:
-                    response.raise_for_status()
+        await self._send("PATCH", API_SYSTEM_UPDATE, priority, json=settings)
 
-    async def restart(self) -> None:
+    async def restart(self, priority: int = PRIORITY_USER) -> None:
         """Restart the device."""
-        url = f"{self.base_url}{API_SYSTEM_RESTART}"
-        async with async_timeout.timeout(10):
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url) as response:
-                    response.raise_for_status()
+        await self._send("POST", API_SYSTEM_RESTART, priority)
 
-    async def identify(self) -> None:
+    async def identify(self, priority: int = PRIORITY_USER) -> None:
         """Trigger device identification."""
-        url = f"{self.base_url}{API_SYSTEM_IDENTIFY}"
-        async with async_timeout.timeout(10):
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url) as response:
-                    response.raise_for_status()
+        await self._send("POST", API_SYSTEM_IDENTIFY, priority)
+
+    async def upload_ota(
+        self,
+        endpoint: str,
+        path: str,
+        progress_callback: Callable[[int], None] | None = None,
+    ) -> None:
+        """Stream a firmware image from disk to an OTA endpoint."""
+        loop = asyncio.get_running_loop()
+        size = await loop.run_in_executor(None, os.path.getsize, path)
+
+        async def _read_chunks() -> AsyncIterator[bytes]:
+            file = await loop.run_in_executor(None, open, path, "rb")
+            try:
+                while chunk := await loop.run_in_executor(
+                    None, file.read, OTA_CHUNK_SIZE
+                ):
+                    yield chunk
+                    if progress_callback is not None:
+                        progress_callback(len(chunk))
+            finally:
+                await loop.run_in_executor(None, file.close)
+
+        async def _request() -> None:
+            url = f"{self.base_url}{endpoint}"
+            headers = {
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(size),
+            }
+            async with async_timeout.timeout(OTA_UPLOAD_TIMEOUT):
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(
+                        url, data=_read_chunks(), headers=headers
+                    ) as response:
+                        response.raise_for_status()
+
+        await self.scheduler.run(PRIORITY_USER, _request)
+
+
+@dataclass
+class _Endpoint:
+    """An optional data source refreshed on its own cadence."""
+
+    key: str
+    path: str
+    fetch: Callable[[], Awaitable[dict[str, Any]]]
+    interval: float
+    refresh_on_new_version: bool = False
+    data: dict[str, Any] | None = None
+    last_fetch: float = float("-inf")
+    version: str | None = None
+
+    def is_due(self, now: float, version: str | None) -> bool:
+        """Return True if the endpoint should be fetched this cycle."""
+        if self.refresh_on_new_version and version != self.version:
+            return True
+        return now - self.last_fetch >= self.interval
 
 
 class BitaxeDataUpdateCoordinator(DataUpdateCoordinator):
@@ -74,11 +207,42 @@ class BitaxeDataUpdateCoordinator(DataUpdateCoordinator):
         api: BitaxeApiClient,
         name: str,
         scan_interval: int,
+        options: Mapping[str, Any] | None = None,
     ) -> None:
         """Initialize the coordinator."""
         self.api = api
         self.name = name
         self._failure_count = 0
+        options = options or {}
+        # Platforms forwarded for the entry; options changes reload the entry
+        self.platforms = (
+            MONITORING_PLATFORMS if options.get(CONF_MONITORING_ONLY, False) else PLATFORMS
+        )
+        self._thresholds = ThresholdMonitor(options)
+        # Created with the device MAC on the first poll, like the energy total
+        self._failover_options = (
+            options if options.get(CONF_POOL_FAILOVER, False) else None
+        )
+        self._pool_failover: PoolFailover | None = None
+        self._share_rates = ShareRateTracker()
+        self._expected_hashrate = ExpectedHashrate()
+        self._energy: EnergyIntegrator | None = None
+        self.history: HistoryRing | None = None
+        self.capture: CaptureWriter | None = None
+        # Incremented on every refresh so consumers can cache per snapshot
+        self.generation = 0
+        self._endpoints = [
+            _Endpoint(
+                ENDPOINT_ASIC,
+                API_SYSTEM_ASIC,
+                api.get_asic_info,
+                ENDPOINT_INTERVALS[ENDPOINT_ASIC],
+                refresh_on_new_version=True,
+            ),
+        ]
+        self._profiler: BitaxeProfiler | None = hass.data.get(DOMAIN, {}).get(
+            DATA_PROFILER
+        )
 
         super().__init__(
             hass,
@@ -87,16 +251,275 @@ class BitaxeDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=scan_interval),
         )
 
+    @property
+    def failure_count(self) -> int:
+        """Return the number of polls that failed in a row."""
+        return self._failure_count
+
+    @property
+    def _profiling(self) -> bool:
+        """Return True while a profiling run is active."""
+        return self._profiler is not None and self._profiler.active
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and notify fleet-wide consumers."""
+        self.generation += 1
+        if not self._profiling:
+            super().async_update_listeners()
+            async_dispatcher_send(self.hass, SIGNAL_COORDINATOR_UPDATE, self)
+            return
+
+        for update_callback, _ in list(self._listeners.values()):
+            start = time.perf_counter()
+            update_callback()
+            entity = getattr(update_callback, "__self__", None)
+            self._profiler.record(
+                STAGE_ENTITY_WRITE,
+                self.name,
+                time.perf_counter() - start,
+                type(entity).__name__ if entity is not None else "listener",
+            )
+
+        start = time.perf_counter()
+        async_dispatcher_send(self.hass, SIGNAL_COORDINATOR_UPDATE, self)
+        self._profiler.record(STAGE_FLEET, self.name, time.perf_counter() - start)
+
+    def _record_fetch_timings(self, start: float, fetched: list[str]) -> None:
+        """Attribute the time of the last poll to I/O, decoding and processing."""
+        timings = [self.api.timings[path] for path in fetched]
+        for queue_time, io_time, decode_time in timings:
+            self._profiler.record(STAGE_QUEUE_WAIT, self.name, queue_time)
+            self._profiler.record(STAGE_API_IO, self.name, io_time)
+            self._profiler.record(STAGE_JSON_DECODE, self.name, decode_time)
+
+        # Requests run concurrently, so only the slowest one adds to the poll time
+        elapsed = time.perf_counter() - start
+        waited = max(queue_time + io_time for queue_time, io_time, _ in timings)
+        decoded = sum(decode_time for _, _, decode_time in timings)
+        self._profiler.record(STAGE_COORDINATOR, self.name, elapsed - waited - decoded)
+
+    async def _async_fetch(self) -> tuple[dict[str, Any], list[str]]:
+        """Fetch system info and every due endpoint concurrently.
+
+        Returns the merged snapshot and the paths that were fetched. Optional
+        endpoints that fail keep their previous data until their next turn.
+        """
+        now = time.monotonic()
+        version = self.data.get("version") if self.data else None
+        due = [endpoint for endpoint in self._endpoints if endpoint.is_due(now, version)]
+
+        info, *results = await asyncio.gather(
+            self.api.get_system_info(),
+            *(endpoint.fetch() for endpoint in due),
+            return_exceptions=True,
+        )
+        if self.capture is not None:
+            await self._async_capture(
+                [API_SYSTEM_INFO, *(endpoint.path for endpoint in due)],
+                [info, *results],
+            )
+        if isinstance(info, BaseException):
+            raise info
+
+        fetched = [API_SYSTEM_INFO]
+        for endpoint, result in zip(due, results):
+            endpoint.last_fetch = now
+            endpoint.version = info.get("version")
+            if isinstance(result, BaseException):
+                _LOGGER.debug(
+                    "Failed to fetch %s from %s: %s", endpoint.path, self.name, result
+                )
+                continue
+            endpoint.data = result
+            fetched.append(endpoint.path)
+
+        for endpoint in self._endpoints:
+            if endpoint.data is not None:
+                info[endpoint.key] = endpoint.data
+
+        return info, fetched
+
+    async def _async_capture(self, paths: list[str], results: list[Any]) -> None:
+        """Append the responses of a poll to the capture file."""
+        line = CaptureWriter.encode(
+            dt_util.utcnow().timestamp(),
+            {
+                path: result
+                for path, result in zip(paths, results)
+                if not isinstance(result, BaseException)
+            },
+            {
+                path: result
+                for path, result in zip(paths, results)
+                if isinstance(result, BaseException)
+            },
+        )
+        await self.hass.async_add_executor_job(self.capture.write, line)
+
+    async def async_start_capture(self, path: str) -> None:
+        """Start appending the response of every poll to a capture file."""
+        if self.capture is not None:
+            raise HomeAssistantError(f"{self.name} is already being captured")
+        self.capture = await self.hass.async_add_executor_job(CaptureWriter, path)
+
+    async def async_stop_capture(self) -> None:
+        """Stop capturing and close the capture file."""
+        if self.capture is not None:
+            capture, self.capture = self.capture, None
+            await self.hass.async_add_executor_job(capture.close)
+
+    async def _async_add_energy(self, data: dict[str, Any]) -> None:
+        """Add the integrated energy and the efficiency to the data."""
+        if self._energy is None:
+            self._energy = EnergyIntegrator(
+                self.hass,
+                data["macAddr"],
+                ENERGY_MAX_GAP_POLLS * self.update_interval.total_seconds(),
+            )
+            await self._energy.async_load()
+
+        power = data.get("power")
+        if power is None:
+            return
+        data["energy"] = self._energy.update(dt_util.utcnow(), power)
+
+        hashrate = data.get("hashRate_10m") or data.get("hashRate") or 0
+        data["efficiency"] = round(power * 1000 / hashrate, 2) if hashrate > 0 else None
+
+    def _placeholder_data(self) -> dict[str, Any]:
+        """Return the data shown while polls fail, keeping the energy total."""
+        if self._energy is None:
+            return DEFAULT_DATA
+        return {**DEFAULT_DATA, "energy": round(self._energy.total, 4)}
+
+    async def _async_add_history(self, data: dict[str, Any]) -> None:
+        """Append the snapshot to the sparkline history ring of the device."""
+        if self.history is None:
+            self.history = await self.hass.async_add_executor_job(
+                HistoryRing, history_path(self.hass, data["macAddr"])
+            )
+        self.history.append(dt_util.utcnow().timestamp(), data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and close the history ring and capture."""
+        await super().async_shutdown()
+        await self.async_stop_capture()
+        if self.history is not None:
+            history, self.history = self.history, None
+            await self.hass.async_add_executor_job(history.close)
+
+    def _fire_threshold_events(self, data: dict[str, Any]) -> None:
+        """Fire a bitaxe_<alert> event for every alert that changed state."""
+        transitions = self._thresholds.check(data)
+        if not transitions:
+            return
+
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, data["macAddr"])}
+        )
+        for alert, active, value in transitions:
+            _LOGGER.info(
+                "%s %s alert %s (%s)",
+                self.name,
+                alert,
+                "raised" if active else "cleared",
+                value,
+            )
+            self.hass.bus.async_fire(
+                f"{DOMAIN}_{alert}",
+                {
+                    "device_id": device.id if device else None,
+                    "name": self.name,
+                    "mac": data["macAddr"],
+                    "active": active,
+                    "value": value,
+                },
+            )
+
+    async def _async_check_pool(self, data: dict[str, Any]) -> None:
+        """Start a pool switch if the failover asks for one."""
+        if self._failover_options is None:
+            return
+        if self._pool_failover is None:
+            self._pool_failover = PoolFailover(
+                self.hass, data["macAddr"], self._failover_options
+            )
+            await self._pool_failover.async_load()
+
+        pool = self._pool_failover.check(dt_util.utcnow().timestamp(), data)
+        if pool is not None:
+            self.hass.async_create_background_task(
+                self._async_switch_pool(data, pool), f"{self.name} pool switch"
+            )
+
+    async def _async_switch_pool(self, data: dict[str, Any], pool: str) -> None:
+        """Select a pool on the device and restart it to connect to that pool."""
+        _LOGGER.warning(
+            "%s switching to its %s pool (reject rate %s%%, error rate %s%%)",
+            self.name,
+            pool,
+            data.get("rejectRate_5m"),
+            data.get("errorPercentage"),
+        )
+        try:
+            await self.api.update_settings(
+                {"useFallbackStratum": int(pool == POOL_FALLBACK)}, PRIORITY_CONTROL
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("Failed to switch %s to its %s pool: %s", self.name, pool, err)
+            return
+
+        try:
+            await self.api.restart(PRIORITY_CONTROL)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Device may close connection before response is received - this is expected
+            pass
+
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, data["macAddr"])}
+        )
+        self.hass.bus.async_fire(
+            f"{DOMAIN}_pool_switch",
+            {
+                "device_id": device.id if device else None,
+                "name": self.name,
+                "mac": data["macAddr"],
+                "pool": pool,
+            },
+        )
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the Bitaxe device."""
+        start = time.perf_counter()
         try:
-            data = await self.api.get_system_info()
+            data, fetched = await self._async_fetch()
             self._failure_count = 0
             
             # Add IP address to data for device info
             data["ip"] = self.api.host
-            
+
+            # Add share rates derived from the counters
+            data.update(self._share_rates.update(time.monotonic(), data))
+
+            # Add energy and efficiency derived from power and hashrate
+            await self._async_add_energy(data)
+
+            # Add the hashrate expected at the current frequency
+            data.update(self._expected_hashrate.update(data))
+
+            await self._async_add_history(data)
+
+            self._fire_threshold_events(data)
+
+            # Add the pool in use and fail over from an unhealthy one
+            data["pool"] = active_pool(data)
+            await self._async_check_pool(data)
+
             _LOGGER.debug("Successfully fetched data from %s: %s", self.name, data)
+
+            if self._profiling:
+                self._record_fetch_timings(start, fetched)
             return data
 
         except asyncio.TimeoutError as err:
@@ -104,18 +527,18 @@ class BitaxeDataUpdateCoordinator(DataUpdateCoordinator):
             if self._failure_count > 3:
                 raise UpdateFailed(f"Timeout connecting to {self.name}") from err
             _LOGGER.warning("Timeout fetching data from %s (attempt %d)", self.name, self._failure_count)
-            return DEFAULT_DATA
+            return self._placeholder_data()
 
         except aiohttp.ClientError as err:
             self._failure_count += 1
             if self._failure_count > 3:
                 raise UpdateFailed(f"Error connecting to {self.name}: {err}") from err
             _LOGGER.warning("Error fetching data from %s (attempt %d): %s", self.name, self._failure_count, err)
-            return DEFAULT_DATA
+            return self._placeholder_data()
 
         except Exception as err:
             self._failure_count += 1
             if self._failure_count > 3:
                 raise UpdateFailed(f"Unexpected error from {self.name}: {err}") from err
             _LOGGER.warning("Unexpected error fetching data from %s (attempt %d): %s", self.name, self._failure_count, err)
-            return DEFAULT_DATA
+            return self._placeholder_data()
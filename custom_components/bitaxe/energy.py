@@ -0,0 +1,62 @@
+"""Energy integration for the Bitaxe integration."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, ENERGY_MAX_GAP, ENERGY_SAVE_DELAY, ENERGY_STORAGE_VERSION
+
+
+def energy_store(hass: HomeAssistant, mac: str) -> Store:
+    """Return the store holding the energy total of a device."""
+    return Store(
+        hass,
+        ENERGY_STORAGE_VERSION,
+        f"{DOMAIN}.energy.{mac.replace(':', '').lower()}",
+    )
+
+
+class EnergyIntegrator:
+    """Integrate power readings into an energy total in kWh.
+
+    Readings are integrated with the trapezoidal rule over the actual poll
+    timestamps. Gaps longer than ``max_gap`` (the device or Home Assistant
+    was down) are not bridged. The coordinator raises it to
+    ``ENERGY_MAX_GAP_POLLS`` scan intervals, so long scan intervals and a
+    single failed poll are still integrated. The total is kept by Home Assistant
+    rather than the device, so it survives device reboots and is persisted
+    across Home Assistant restarts.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, mac: str, max_gap: float = ENERGY_MAX_GAP
+    ) -> None:
+        """Initialize the integrator."""
+        self._store = energy_store(hass, mac)
+        self._max_gap = max(max_gap, ENERGY_MAX_GAP)
+        self.total = 0.0
+        self._last: tuple[datetime, float] | None = None
+
+    async def async_load(self) -> None:
+        """Restore the persisted total."""
+        if (data := await self._store.async_load()) is not None:
+            self.total = data["total"]
+
+    def update(self, now: datetime, power: float) -> float:
+        """Add a power reading in watts and return the total in kWh."""
+        if self._last is not None:
+            last_time, last_power = self._last
+            elapsed = (now - last_time).total_seconds()
+            if 0 < elapsed <= self._max_gap:
+                self.total += (last_power + power) / 2 * elapsed / 3_600_000
+        self._last = (now, power)
+
+        self._store.async_delay_save(self._data_to_save, ENERGY_SAVE_DELAY)
+        return round(self.total, 4)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"total": self.total}
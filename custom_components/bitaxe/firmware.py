@@ -0,0 +1,115 @@
+"""Firmware updates for the Bitaxe integration."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    API_SYSTEM_OTA,
+    API_SYSTEM_OTA_WWW,
+    SIGNAL_FIRMWARE_PROGRESS,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+from .fleet import async_wait_for_recovery
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class FirmwareImage:
+    """Firmware and web UI images staged for installation."""
+
+    version: str
+    firmware_path: str
+    www_path: str | None = None
+
+
+class BitaxeFirmwareManager:
+    """Install staged firmware on devices with bounded concurrency."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        image: FirmwareImage,
+        max_parallel: int,
+        timeout: float,
+    ) -> None:
+        """Initialize the firmware manager."""
+        self.hass = hass
+        self.image = image
+        self.timeout = timeout
+        self.progress: dict[str, int] = {}
+        self._semaphore = asyncio.Semaphore(max_parallel)
+
+    async def async_install(self, coordinator: BitaxeDataUpdateCoordinator) -> bool:
+        """Upload the staged images to a device and wait for it to recover."""
+        mac = coordinator.data["macAddr"]
+        uptime_before = coordinator.data.get("uptimeSeconds") or 0
+        hashrate_before = coordinator.data.get("hashRate") or 0
+
+        uploads = [
+            (API_SYSTEM_OTA_WWW, self.image.www_path),
+            (API_SYSTEM_OTA, self.image.firmware_path),
+        ]
+        uploads = [(endpoint, path) for endpoint, path in uploads if path]
+        sizes = await self.hass.async_add_executor_job(
+            lambda: [os.path.getsize(path) for _, path in uploads]
+        )
+        total = max(sum(sizes), 1)
+        sent = 0
+
+        def _progress(chunk: int) -> None:
+            nonlocal sent
+            sent += chunk
+            percent = min(int(sent * 100 / total), 99)
+            if percent != self.progress.get(mac):
+                self._set_progress(mac, percent)
+
+        async with self._semaphore:
+            self._set_progress(mac, 0)
+            try:
+                for endpoint, path in uploads:
+                    _LOGGER.info("Uploading %s to %s", path, coordinator.name)
+                    try:
+                        await coordinator.api.upload_ota(endpoint, path, _progress)
+                    except aiohttp.ServerDisconnectedError:
+                        # Device reboots as soon as the firmware image is written
+                        if endpoint != API_SYSTEM_OTA:
+                            raise
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Firmware upload to %s failed: %s", coordinator.name, err)
+                self._set_progress(mac, None)
+                return False
+
+            recovered = await async_wait_for_recovery(
+                coordinator,
+                uptime_before,
+                hashrate_before,
+                self.timeout,
+                version=self.image.version,
+            )
+            self._set_progress(mac, None)
+
+        if not recovered:
+            _LOGGER.warning(
+                "%s did not report version %s with recovered hashrate within %ss",
+                coordinator.name,
+                self.image.version,
+                self.timeout,
+            )
+        return recovered
+
+    def _set_progress(self, mac: str, percent: int | None) -> None:
+        """Record install progress for a device and notify its update entity."""
+        if percent is None:
+            self.progress.pop(mac, None)
+        else:
+            self.progress[mac] = percent
+        async_dispatcher_send(self.hass, SIGNAL_FIRMWARE_PROGRESS, mac)
@@ -0,0 +1,203 @@
+"""Fleet-wide helpers for the Bitaxe integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    DOMAIN,
+    RECOVERY_HASHRATE_RATIO,
+    RECOVERY_POLL_INTERVAL,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .firmware import BitaxeFirmwareManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def async_get_coordinators(
+    hass: HomeAssistant, device_ids: list[str] | None = None
+) -> list[BitaxeDataUpdateCoordinator]:
+    """Return the loaded coordinators, optionally limited to the given devices."""
+    coordinators: dict[str, BitaxeDataUpdateCoordinator] = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, BitaxeDataUpdateCoordinator)
+    }
+
+    if not device_ids:
+        return list(coordinators.values())
+
+    device_registry = dr.async_get(hass)
+    selected: list[BitaxeDataUpdateCoordinator] = []
+    for device_id in device_ids:
+        device = device_registry.async_get(device_id)
+        if device is None:
+            raise HomeAssistantError(f"Unknown device {device_id}")
+        for entry_id in device.config_entries:
+            coordinator = coordinators.get(entry_id)
+            if coordinator is not None and coordinator not in selected:
+                selected.append(coordinator)
+
+    return selected
+
+
+async def async_wait_for_recovery(
+    coordinator: BitaxeDataUpdateCoordinator,
+    uptime_before: int,
+    hashrate_before: float,
+    timeout: float,
+    version: str | None = None,
+) -> bool:
+    """Wait until a restarted device reports a reset uptime and recovered hashrate.
+
+    When a version is given, the device must also report that firmware version.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    target_hashrate = hashrate_before * RECOVERY_HASHRATE_RATIO
+    restarted = False
+
+    while loop.time() < deadline:
+        await asyncio.sleep(RECOVERY_POLL_INTERVAL)
+        try:
+            data = await coordinator.api.get_system_info()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Device is still rebooting
+            continue
+
+        uptime = data.get("uptimeSeconds") or 0
+        hashrate = data.get("hashRate") or 0
+
+        if not restarted:
+            restarted = uptime < uptime_before
+        if version is not None and data.get("version") != version:
+            continue
+        if restarted and hashrate > 0 and hashrate >= target_hashrate:
+            _LOGGER.debug(
+                "%s recovered after restart (uptime %ss, hashrate %.1f GH/s)",
+                coordinator.name,
+                uptime,
+                hashrate,
+            )
+            await coordinator.async_request_refresh()
+            return True
+
+    return False
+
+
+async def _async_restart_and_wait(
+    coordinator: BitaxeDataUpdateCoordinator, timeout: float
+) -> bool:
+    """Restart a single device and wait for it to come back healthy."""
+    uptime_before = coordinator.data.get("uptimeSeconds") or 0
+    hashrate_before = coordinator.data.get("hashRate") or 0
+
+    try:
+        await coordinator.api.restart()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # Device may close connection before response is received - this is expected
+        pass
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.error("Failed to restart %s: %s", coordinator.name, err)
+        return False
+
+    _LOGGER.info("Restart command sent to %s, waiting for recovery", coordinator.name)
+    return await async_wait_for_recovery(
+        coordinator, uptime_before, hashrate_before, timeout
+    )
+
+
+async def _async_run_in_batches(
+    batches: list[list[BitaxeDataUpdateCoordinator]],
+    action: Callable[[BitaxeDataUpdateCoordinator], Awaitable[bool]],
+    max_failures: int,
+    description: str,
+) -> None:
+    """Run an action on each batch of devices, stopping after too many failures."""
+    failed: list[str] = []
+
+    for batch in batches:
+        _LOGGER.info("%s: starting %s", description, ", ".join(c.name for c in batch))
+
+        results = await asyncio.gather(*(action(coordinator) for coordinator in batch))
+
+        for coordinator, recovered in zip(batch, results):
+            if not recovered:
+                _LOGGER.warning("%s: %s did not recover", description, coordinator.name)
+                failed.append(coordinator.name)
+
+        if max_failures and len(failed) >= max_failures:
+            raise HomeAssistantError(
+                f"{description} aborted, devices failed to recover: {', '.join(failed)}"
+            )
+
+    if failed:
+        _LOGGER.warning(
+            "%s finished with unrecovered devices: %s", description, ", ".join(failed)
+        )
+    else:
+        _LOGGER.info("%s finished", description)
+
+
+async def async_rolling_restart(
+    coordinators: list[BitaxeDataUpdateCoordinator],
+    batch_size: int,
+    timeout: float,
+    max_failures: int,
+) -> None:
+    """Restart devices in batches, waiting for each batch to recover."""
+    batches = [
+        coordinators[start : start + batch_size]
+        for start in range(0, len(coordinators), batch_size)
+    ]
+    await _async_run_in_batches(
+        batches,
+        lambda coordinator: _async_restart_and_wait(coordinator, timeout),
+        max_failures,
+        "Rolling restart",
+    )
+
+
+async def async_firmware_rollout(
+    manager: BitaxeFirmwareManager,
+    coordinators: list[BitaxeDataUpdateCoordinator],
+    canary_size: int,
+    batch_size: int,
+    max_failures: int,
+) -> None:
+    """Install the staged firmware in stages, starting with a canary batch.
+
+    Each stage must report the new version and a recovered hashrate before
+    the next stage starts. Devices already on the staged version are skipped.
+    """
+    pending = [
+        coordinator
+        for coordinator in coordinators
+        if coordinator.data.get("version") != manager.image.version
+    ]
+    if not pending:
+        _LOGGER.info("All devices already run firmware %s", manager.image.version)
+        return
+
+    batches = [pending[:canary_size]]
+    batches.extend(
+        pending[start : start + batch_size]
+        for start in range(canary_size, len(pending), batch_size)
+    )
+    await _async_run_in_batches(
+        batches,
+        manager.async_install,
+        max_failures,
+        f"Firmware rollout to {manager.image.version}",
+    )
@@ -0,0 +1,143 @@
+"""Frequency limits shared by the Bitaxe frequency controllers."""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_FREQUENCY_LIMITS,
+    DOMAIN,
+    FREQUENCY_SAVE_DELAY,
+    FREQUENCY_STORAGE_VERSION,
+    FREQUENCY_WRITE_TIMEOUT,
+)
+
+
+def frequency_store(hass: HomeAssistant, mac: str) -> Store:
+    """Return the store holding the frequency limits of a device."""
+    return Store(
+        hass,
+        FREQUENCY_STORAGE_VERSION,
+        f"{DOMAIN}.frequency.{mac.replace(':', '').lower()}",
+    )
+
+
+class FrequencyLimits:
+    """Track the frequency the user set and the limits controllers put below it.
+
+    The power budget and thermal controllers each hold their own limit, and
+    the device runs at the lowest one. Neither controller can take the
+    frequency the other throttled to for the user's setting, and lifting one
+    limit leaves the other in place. A reading that differs from the expected
+    frequency is a manual change: it becomes the new baseline and clears the
+    limits. Readings are ignored while a write has not shown up yet, for up
+    to ``FREQUENCY_WRITE_TIMEOUT``. The baseline and the limits are
+    persisted, since the throttled frequency survives a Home Assistant
+    restart on the device.
+    """
+
+    def __init__(
+        self,
+        frequency: int,
+        store: Store | None = None,
+        limits: dict[str, int] | None = None,
+    ) -> None:
+        """Initialize the limits of a device running at the given frequency."""
+        self.baseline = frequency
+        self._store = store
+        self._limits: dict[str, int] = dict(limits or {})
+        self._written: int | None = None
+        self.last_write = -math.inf
+
+    @property
+    def target(self) -> int:
+        """Return the frequency the device should run at."""
+        return min([self.baseline, *self._limits.values()])
+
+    @property
+    def pending(self) -> bool:
+        """Return True while the last write has not shown up in a reading."""
+        return self._written is not None
+
+    def limit(self, owner: str) -> int | None:
+        """Return the limit a controller holds, if any."""
+        return self._limits.get(owner)
+
+    def target_with(self, owner: str, limit: int | None) -> int:
+        """Return the target if a controller changed its limit."""
+        limits = {**self._limits, owner: limit or self.baseline}
+        return min([self.baseline, *limits.values()])
+
+    def observe(self, frequency: int, now: float) -> None:
+        """Track a frequency reading from the device."""
+        if self._written is not None:
+            timed_out = now - self.last_write >= FREQUENCY_WRITE_TIMEOUT
+            if frequency != self._written and not timed_out:
+                # Reading from before the last write, not a manual change
+                return
+            self._written = None
+
+        if frequency != self.target:
+            # Changed on the device, follow the user's setting
+            self.baseline = frequency
+            self._limits.clear()
+            self._save()
+
+    def set_limit(self, owner: str, limit: int | None, now: float) -> None:
+        """Set or clear the limit of a controller once it has been written."""
+        target = self.target_with(owner, limit)
+        if target != self.target:
+            self._written = target
+            self.last_write = now
+
+        if limit is None or limit >= self.baseline:
+            self._limits.pop(owner, None)
+        else:
+            self._limits[owner] = limit
+        self._save()
+
+    def _save(self) -> None:
+        """Schedule saving the baseline and the limits."""
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, FREQUENCY_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"baseline": self.baseline, "limits": self._limits}
+
+
+@callback
+def _async_devices(hass: HomeAssistant) -> dict[str, FrequencyLimits]:
+    """Return the frequency limits of every device, keyed by MAC address."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_FREQUENCY_LIMITS, {})
+
+
+async def async_load_frequency_limits(hass: HomeAssistant, mac: str) -> None:
+    """Restore the saved frequency limits of a device, if there are any."""
+    devices = _async_devices(hass)
+    if mac in devices:
+        return
+    store = frequency_store(hass, mac)
+    if (data := await store.async_load()) is not None and mac not in devices:
+        devices[mac] = FrequencyLimits(data["baseline"], store, data["limits"])
+
+
+@callback
+def async_get_frequency_limits(
+    hass: HomeAssistant, mac: str, frequency: int
+) -> FrequencyLimits:
+    """Return the frequency limits of a device, created at its current frequency.
+
+    The limits are kept per MAC address for the lifetime of the integration,
+    and restored from storage when the entry is set up, so neither a reload
+    nor a restart turns a throttled frequency into the baseline.
+    """
+    devices = _async_devices(hass)
+    if (limits := devices.get(mac)) is None:
+        limits = devices[mac] = FrequencyLimits(
+            frequency, frequency_store(hass, mac)
+        )
+    return limits
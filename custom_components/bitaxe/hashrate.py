@@ -0,0 +1,55 @@
+"""Expected hashrate model for the Bitaxe integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import ASIC_SMALL_CORES, ENDPOINT_ASIC
+
+
+class ExpectedHashrate:
+    """Derive the hashrate a device should reach at its current frequency.
+
+    Every small core of every chip finds one hash per clock cycle, so a
+    device should do ``frequency * small cores * chips`` hashes per second.
+    Core and chip counts come from the ASIC endpoint, then from system
+    info, with ``ASIC_SMALL_CORES`` as fallback for older firmware. The
+    expected hashrate is only recalculated when one of its inputs changes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the model."""
+        self._inputs: tuple[Any, ...] | None = None
+        self._expected: float | None = None
+
+    def _calculate(self, data: dict[str, Any]) -> float | None:
+        """Return the expected hashrate in GH/s."""
+        asic = data.get(ENDPOINT_ASIC) or {}
+        model = asic.get("ASICModel") or data.get("ASICModel")
+        small_cores = (
+            asic.get("smallCoreCount")
+            or data.get("smallCoreCount")
+            or ASIC_SMALL_CORES.get(model)
+        )
+        chips = asic.get("asicCount") or data.get("asicCount") or 1
+        frequency = data.get("frequency")
+
+        inputs = (frequency, small_cores, chips)
+        if inputs != self._inputs:
+            self._inputs = inputs
+            self._expected = (
+                round(frequency * small_cores * chips / 1000, 1)
+                if frequency and small_cores
+                else None
+            )
+        return self._expected
+
+    def update(self, data: dict[str, Any]) -> dict[str, float | None]:
+        """Return the expected hashrate and the share of it being reached."""
+        expected = self._calculate(data)
+        hashrate = data.get("hashRate_10m") or data.get("hashRate")
+        return {
+            "expectedHashrate": expected,
+            "hashrateEfficiency": round(hashrate * 100 / expected, 1)
+            if expected and hashrate is not None
+            else None,
+        }
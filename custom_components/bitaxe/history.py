@@ -0,0 +1,117 @@
+"""Sparkline history ring files for the Bitaxe integration."""
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, HISTORY_CAPACITY, HISTORY_FIELDS, HISTORY_VERSION
+
+# Magic, version, record size, capacity and index of the next record to write
+_HEADER = struct.Struct("<4sHHII")
+_MAGIC = b"BXHR"
+# Unix timestamp followed by one float per history field; NaN marks a missing value
+_RECORD = struct.Struct("<d" + "f" * len(HISTORY_FIELDS))
+
+
+def history_path(hass: HomeAssistant, mac: str) -> str:
+    """Return the path of the history ring file of a device."""
+    return hass.config.path(
+        STORAGE_DIR, f"{DOMAIN}.history.{mac.replace(':', '').lower()}"
+    )
+
+
+def remove_history(path: str) -> None:
+    """Remove a history ring file, if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class HistoryRing:
+    """A fixed-size ring of fixed-width samples in a memory-mapped file.
+
+    The file holds a small header followed by ``HISTORY_CAPACITY`` records,
+    so it never grows and the oldest sample is overwritten once it is full.
+    Appending is a write into the mapping and costs no system call, which
+    lets the coordinator record every poll from the event loop. Opening,
+    reading and closing touch the disk and must run in the executor.
+    """
+
+    def __init__(self, path: str, capacity: int = HISTORY_CAPACITY) -> None:
+        """Open the ring file, creating or resetting it if its layout differs."""
+        self.capacity = capacity
+        size = _HEADER.size + capacity * _RECORD.size
+        header = _HEADER.pack(_MAGIC, HISTORY_VERSION, _RECORD.size, capacity, 0)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        existing = self._file.read(_HEADER.size)
+        if len(existing) != _HEADER.size or existing[:-4] != header[:-4]:
+            self._file.truncate(0)
+            self._file.truncate(size)
+            self._file.seek(0)
+            self._file.write(header)
+            self._file.flush()
+        elif os.fstat(self._file.fileno()).st_size != size:
+            self._file.truncate(size)
+
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._head = _HEADER.unpack_from(self._map)[4] % capacity
+
+    def append(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Write a sample over the oldest record."""
+        values = (data.get(field) for field in HISTORY_FIELDS)
+        _RECORD.pack_into(
+            self._map,
+            _HEADER.size + self._head * _RECORD.size,
+            timestamp,
+            *(
+                float(value) if isinstance(value, (int, float)) else math.nan
+                for value in values
+            ),
+        )
+        self._head = (self._head + 1) % self.capacity
+        struct.pack_into("<I", self._map, _HEADER.size - 4, self._head)
+
+    def read(self, since: float, points: int) -> list[list[float | None]]:
+        """Return the samples since a timestamp averaged into at most ``points`` buckets.
+
+        Each returned point is the mean timestamp of its bucket followed by
+        the mean of every history field, or None where the field was missing
+        for the whole bucket. Buckets without samples are left out.
+        """
+        records = _RECORD.iter_unpack(self._map[_HEADER.size :])
+        samples = [record for record in records if record[0] >= since]
+        if not samples:
+            return []
+        samples.sort()
+
+        width = max((samples[-1][0] - since) / points, 1e-9)
+        buckets: dict[int, list[tuple[float, ...]]] = {}
+        for sample in samples:
+            index = min(int((sample[0] - since) / width), points - 1)
+            buckets.setdefault(index, []).append(sample)
+
+        result = []
+        for bucket in buckets.values():
+            point: list[float | None] = [sum(sample[0] for sample in bucket) / len(bucket)]
+            for column in range(1, len(HISTORY_FIELDS) + 1):
+                values = [
+                    sample[column] for sample in bucket if not math.isnan(sample[column])
+                ]
+                point.append(round(sum(values) / len(values), 2) if values else None)
+            result.append(point)
+        return result
+
+    def close(self) -> None:
+        """Flush the mapping to disk and close the file."""
+        self._map.flush()
+        self._map.close()
+        self._file.close()
@@ -0,0 +1,110 @@
+"""Bulk import of Bitaxe devices."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import logging
+from typing import Any
+
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from .config_flow import validate_input
+from .const import DOMAIN, IMPORT_MAX_PARALLEL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_host(value: str, default_port: int) -> tuple[str, int]:
+    """Split an optional ``:port`` suffix off a host.
+
+    An IPv6 address only carries a port in brackets, as in ``[fe80::1]:8080``.
+    The brackets are kept, since the host goes into the device URL.
+    """
+    value = value.strip()
+    host, separator, port = value.rpartition(":")
+    if separator and port.isdigit() and (host.endswith("]") if ":" in host else host):
+        return host, int(port)
+    return value, default_port
+
+
+async def async_import_hosts(
+    hass: HomeAssistant, hosts: list[str], port: int, scan_interval: int
+) -> dict[str, list[dict[str, Any]]]:
+    """Validate a list of hosts and create a config entry for every new device.
+
+    Hosts are validated concurrently, at most ``IMPORT_MAX_PARALLEL`` at a
+    time. Devices are deduplicated by MAC address, both within the list and
+    against the configured entries. Returns the created, skipped and failed
+    hosts.
+    """
+    targets = list(dict.fromkeys(parse_host(host, port) for host in hosts))
+    semaphore = asyncio.Semaphore(IMPORT_MAX_PARALLEL)
+
+    async def _async_validate(host: str, host_port: int) -> dict[str, Any]:
+        async with semaphore:
+            return await validate_input(hass, {CONF_HOST: host, CONF_PORT: host_port})
+
+    results = await asyncio.gather(
+        *(_async_validate(host, host_port) for host, host_port in targets),
+        return_exceptions=True,
+    )
+
+    configured = {
+        entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    report: dict[str, list[dict[str, Any]]] = {
+        "created": [],
+        "skipped": [],
+        "failed": [],
+    }
+    found: dict[str, tuple[str, int, str]] = {}
+    for (host, host_port), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            report["failed"].append(
+                {"host": host, "error": str(result) or type(result).__name__}
+            )
+            continue
+        mac = result["mac"]
+        if mac in configured or mac in found:
+            reason = "already_configured" if mac in configured else "duplicate"
+            report["skipped"].append({"host": host, "mac": mac, "reason": reason})
+        else:
+            found[mac] = (host, host_port, result["title"])
+
+    # Default hostnames are shared by many devices, so tell those apart by MAC
+    titles = Counter(title for _, _, title in found.values())
+    imports = []
+    for mac, (host, host_port, title) in found.items():
+        if titles[title] > 1:
+            title = f"{title} {mac[-8:].replace(':', '')}"
+        imports.append(
+            {CONF_HOST: host, CONF_PORT: host_port, CONF_NAME: title, "mac": mac}
+        )
+
+    results = await asyncio.gather(
+        *(
+            hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={**data, CONF_SCAN_INTERVAL: scan_interval},
+            )
+            for data in imports
+        )
+    )
+    for data, result in zip(imports, results):
+        item = {"host": data[CONF_HOST], "mac": data["mac"]}
+        if result["type"] == FlowResultType.CREATE_ENTRY:
+            report["created"].append({**item, "name": data[CONF_NAME]})
+        else:
+            # Added by someone else while the hosts were being validated
+            report["skipped"].append({**item, "reason": result.get("reason")})
+
+    if report["failed"]:
+        _LOGGER.warning(
+            "Could not import %s",
+            ", ".join(f"{item['host']} ({item['error']})" for item in report["failed"]),
+        )
+    return report
@@ -0,0 +1,188 @@
+"""Prometheus metrics view for the Bitaxe integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import API_SYSTEM_INFO, DOMAIN, METRICS_CONTENT_TYPE, METRICS_URL
+from .coordinator import BitaxeDataUpdateCoordinator
+from .fleet import async_get_coordinators
+
+_Value = Callable[[BitaxeDataUpdateCoordinator], Any]
+
+
+def _data(key: str) -> _Value:
+    """Return a getter for a snapshot value, skipped while the device is down."""
+
+    def _get(coordinator: BitaxeDataUpdateCoordinator) -> Any:
+        if coordinator.failure_count:
+            # The snapshot is placeholder data until the device answers again
+            return None
+        return coordinator.data.get(key)
+
+    return _get
+
+
+def _latency(coordinator: BitaxeDataUpdateCoordinator) -> float | None:
+    """Return the duration of the last system info request, without queueing."""
+    timing = coordinator.api.timings.get(API_SYSTEM_INFO)
+    return timing[1] if timing is not None else None
+
+
+# Name, type, help and value of every exported metric family
+METRICS: tuple[tuple[str, str, str, _Value], ...] = (
+    (
+        "bitaxe_up",
+        "gauge",
+        "Whether the last poll of the device succeeded.",
+        lambda coordinator: int(
+            coordinator.last_update_success and not coordinator.failure_count
+        ),
+    ),
+    (
+        "bitaxe_poll_failures",
+        "gauge",
+        "Consecutive failed polls.",
+        lambda coordinator: coordinator.failure_count,
+    ),
+    (
+        "bitaxe_poll_latency_seconds",
+        "gauge",
+        "Duration of the last system info request.",
+        _latency,
+    ),
+    ("bitaxe_hashrate_ghs", "gauge", "Current hashrate in GH/s.", _data("hashRate")),
+    (
+        "bitaxe_hashrate_10m_ghs",
+        "gauge",
+        "10 minute average hashrate in GH/s.",
+        _data("hashRate_10m"),
+    ),
+    (
+        "bitaxe_expected_hashrate_ghs",
+        "gauge",
+        "Hashrate expected at the current frequency in GH/s.",
+        _data("expectedHashrate"),
+    ),
+    ("bitaxe_temperature_celsius", "gauge", "ASIC temperature.", _data("temp")),
+    (
+        "bitaxe_vr_temperature_celsius",
+        "gauge",
+        "Voltage regulator temperature.",
+        _data("vrTemp"),
+    ),
+    ("bitaxe_power_watts", "gauge", "Power consumption.", _data("power")),
+    ("bitaxe_efficiency_jth", "gauge", "Efficiency in J/TH.", _data("efficiency")),
+    ("bitaxe_frequency_mhz", "gauge", "ASIC frequency.", _data("frequency")),
+    ("bitaxe_fan_rpm", "gauge", "Fan speed.", _data("fanrpm")),
+    (
+        "bitaxe_shares_accepted_total",
+        "counter",
+        "Accepted shares since the device booted.",
+        _data("sharesAccepted"),
+    ),
+    (
+        "bitaxe_shares_rejected_total",
+        "counter",
+        "Rejected shares since the device booted.",
+        _data("sharesRejected"),
+    ),
+    (
+        "bitaxe_reject_rate_percent",
+        "gauge",
+        "Share reject rate over the last 5 minutes.",
+        _data("rejectRate_5m"),
+    ),
+    (
+        "bitaxe_energy_kwh_total",
+        "counter",
+        "Integrated energy consumption.",
+        _data("energy"),
+    ),
+    ("bitaxe_uptime_seconds", "gauge", "Device uptime.", _data("uptimeSeconds")),
+    ("bitaxe_free_heap_bytes", "gauge", "Free heap memory.", _data("freeHeap")),
+)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_samples(coordinator: BitaxeDataUpdateCoordinator) -> list[str | None]:
+    """Render the sample line of every metric family for one device."""
+    name, mac = coordinator.name, ""
+    if (entry := coordinator.config_entry) is not None:
+        name, mac = entry.title, entry.unique_id or ""
+    labels = f'{{name="{_escape(name)}",mac="{_escape(mac)}"}}'
+
+    samples: list[str | None] = []
+    for metric, _, _, value in METRICS:
+        result = value(coordinator)
+        if isinstance(result, bool) or not isinstance(result, (int, float)):
+            samples.append(None)
+        else:
+            samples.append(f"{metric}{labels} {result}")
+    return samples
+
+
+class BitaxeMetricsView(HomeAssistantView):
+    """Serve the latest snapshot of every device in the Prometheus text format.
+
+    Scrapes read the coordinator snapshots directly instead of the state
+    machine. The sample lines of a device are only rendered again after its
+    next poll, and the whole body is reused while no device has polled.
+    """
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._samples: dict[
+            BitaxeDataUpdateCoordinator, tuple[int, list[str | None]]
+        ] = {}
+        self._generations: tuple[tuple[BitaxeDataUpdateCoordinator, int], ...] = ()
+        self._body = b""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of every loaded device."""
+        hass: HomeAssistant = request.app["hass"]
+        generations = tuple(
+            (coordinator, coordinator.generation)
+            for coordinator in async_get_coordinators(hass)
+        )
+        if generations != self._generations:
+            self._body = self._render(generations)
+            self._generations = generations
+
+        return web.Response(
+            body=self._body, headers={"Content-Type": METRICS_CONTENT_TYPE}
+        )
+
+    def _render(
+        self, generations: tuple[tuple[BitaxeDataUpdateCoordinator, int], ...]
+    ) -> bytes:
+        """Render the body, reusing the samples of devices that did not poll."""
+        samples = {}
+        for coordinator, generation in generations:
+            cached = self._samples.get(coordinator)
+            if cached is None or cached[0] != generation:
+                cached = (generation, _render_samples(coordinator))
+            samples[coordinator] = cached
+        self._samples = samples
+
+        lines = []
+        for index, (name, metric_type, help_text, _) in enumerate(METRICS):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for _, device_samples in samples.values():
+                if (sample := device_samples[index]) is not None:
+                    lines.append(sample)
+        lines.append("")
+        return "\n".join(lines).encode()
@@ -0,0 +1,139 @@
+"""Pool failover for the Bitaxe integration."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_FAILOVER_ERROR_RATE,
+    CONF_FAILOVER_REJECT_RATE,
+    CONF_FAILOVER_WINDOW,
+    DEFAULT_FAILOVER_ERROR_RATE,
+    DEFAULT_FAILOVER_REJECT_RATE,
+    DEFAULT_FAILOVER_WINDOW,
+    DOMAIN,
+    POOL_FALLBACK,
+    POOL_PRIMARY,
+    POOL_STORAGE_VERSION,
+    POOL_SWITCH_BACK_AFTER,
+    POOL_SWITCH_COOLDOWN,
+)
+
+
+def active_pool(data: Mapping[str, Any]) -> str:
+    """Return which of its pools the device is mining on."""
+    return POOL_FALLBACK if data.get("isUsingFallbackStratum") else POOL_PRIMARY
+
+
+def pool_store(hass: HomeAssistant, mac: str) -> Store:
+    """Return the store holding the pool failover state of a device."""
+    return Store(
+        hass,
+        POOL_STORAGE_VERSION,
+        f"{DOMAIN}.pool.{mac.replace(':', '').lower()}",
+    )
+
+
+class PoolFailover:
+    """Decide when a device should move between its primary and fallback pool.
+
+    The primary pool is unhealthy while the 5 minute reject rate or the
+    device error rate is at or above its threshold. Once it has stayed
+    unhealthy for the whole window, the device is moved to its fallback
+    pool. After ``POOL_SWITCH_BACK_AFTER`` on the fallback the primary is
+    tried again; if it is still bad, the window has to pass again before
+    the next failover. No two switches are closer than
+    ``POOL_SWITCH_COOLDOWN``, and a device that is on its fallback for
+    another reason (set by hand, or by the firmware because the primary
+    was unreachable) is left alone. Whether the device was failed over, and
+    when it last switched, are persisted, so a reload or restart does not
+    leave it on the fallback for good.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, mac: str, options: Mapping[str, Any]
+    ) -> None:
+        """Initialize the failover from the entry options."""
+        self._store = pool_store(hass, mac)
+        self.reject_rate = options.get(
+            CONF_FAILOVER_REJECT_RATE, DEFAULT_FAILOVER_REJECT_RATE
+        )
+        self.error_rate = options.get(CONF_FAILOVER_ERROR_RATE, DEFAULT_FAILOVER_ERROR_RATE)
+        self.window = options.get(CONF_FAILOVER_WINDOW, DEFAULT_FAILOVER_WINDOW)
+        self._unhealthy_since: float | None = None
+        self._last_switch: float | None = None
+        self._failed_over = False
+
+    async def async_load(self) -> None:
+        """Restore the persisted failover state."""
+        if (data := await self._store.async_load()) is not None:
+            self._failed_over = data["failed_over"]
+            self._last_switch = data["last_switch"]
+
+    def _unhealthy(self, data: Mapping[str, Any]) -> bool:
+        """Return True if the current pool is over either threshold."""
+        reject_rate = data.get("rejectRate_5m")
+        error_rate = data.get("errorPercentage")
+        return (reject_rate is not None and reject_rate >= self.reject_rate) or (
+            error_rate is not None and error_rate >= self.error_rate
+        )
+
+    def check(self, now: float, data: Mapping[str, Any]) -> str | None:
+        """Return the pool to switch to, or None to stay on the current one.
+
+        ``now`` is a Unix timestamp, so the persisted switch time stays
+        meaningful across restarts.
+        """
+        if not data.get("fallbackStratumURL"):
+            return None
+
+        if self._unhealthy(data):
+            if self._unhealthy_since is None:
+                self._unhealthy_since = now
+        else:
+            self._unhealthy_since = None
+
+        since_switch = (
+            math.inf if self._last_switch is None else now - self._last_switch
+        )
+        if since_switch < POOL_SWITCH_COOLDOWN:
+            return None
+
+        pool = active_pool(data)
+        if pool == POOL_PRIMARY and self._failed_over:
+            # Back on the primary, by us, by hand or by the firmware
+            self._failed_over = False
+            self._store.async_delay_save(self._data_to_save)
+
+        if (
+            pool == POOL_PRIMARY
+            and self._unhealthy_since is not None
+            and now - self._unhealthy_since >= self.window
+        ):
+            self._switched(now, True)
+            return POOL_FALLBACK
+
+        if (
+            pool == POOL_FALLBACK
+            and self._failed_over
+            and since_switch >= POOL_SWITCH_BACK_AFTER
+        ):
+            self._switched(now, False)
+            return POOL_PRIMARY
+
+        return None
+
+    def _switched(self, now: float, failed_over: bool) -> None:
+        """Record a switch."""
+        self._last_switch = now
+        self._failed_over = failed_over
+        self._unhealthy_since = None
+        self._store.async_delay_save(self._data_to_save)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"failed_over": self._failed_over, "last_switch": self._last_switch}
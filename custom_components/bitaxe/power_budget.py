@@ -0,0 +1,269 @@
+"""Fleet power-budget controller for the Bitaxe integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_POWER_BUDGET,
+    POWER_BUDGET_FREQUENCY_STEP,
+    POWER_BUDGET_MAX_STEPS,
+    POWER_BUDGET_MIN_FREQUENCY,
+    PRIORITY_CONTROL,
+    SIGNAL_COORDINATOR_UPDATE,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+from .fleet import async_get_coordinators
+from .frequency import FrequencyLimits, async_get_frequency_limits
+
+_LOGGER = logging.getLogger(__name__)
+
+EVALUATE_COOLDOWN = 1.0  # seconds
+SETTLE_POLLS = 2
+
+
+class BitaxePowerBudgetController:
+    """Keep the total fleet power draw below a budget by stepping frequency.
+
+    Devices are throttled least efficient (highest W per GH/s) first and
+    restored most efficient first. A device is not touched again until a
+    couple of polls have passed since the previous write, and frequency is only
+    restored when the estimated draw stays below the budget minus a margin,
+    so the controller settles instead of oscillating around the limit.
+    Devices that stop answering are counted at their last known draw, so an
+    outage does not free up budget for the rest of the fleet. The limit is
+    kept in the device's shared ``FrequencyLimits``, next to the one of the
+    thermal controller.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str, margin: float) -> None:
+        """Initialize the controller."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.margin = margin
+        self._last_power: dict[BitaxeDataUpdateCoordinator, float] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=EVALUATE_COOLDOWN,
+            immediate=False,
+            function=self._async_evaluate,
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Start reacting to budget changes and device polls."""
+        self._unsubs.append(
+            async_track_state_change_event(
+                self.hass, [self.entity_id], self._async_budget_changed
+            )
+        )
+        self._unsubs.append(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_COORDINATOR_UPDATE, self._async_coordinator_updated
+            )
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the controller."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        self._debouncer.async_cancel()
+
+    @callback
+    def _async_budget_changed(self, event: Event) -> None:
+        """Handle a change of the budget entity."""
+        self.hass.async_create_task(self._debouncer.async_call())
+
+    @callback
+    def _async_coordinator_updated(self, coordinator: BitaxeDataUpdateCoordinator) -> None:
+        """Handle a completed device poll."""
+        self.hass.async_create_task(self._debouncer.async_call())
+
+    def _get_budget(self) -> float | None:
+        """Return the current budget in watts."""
+        state = self.hass.states.get(self.entity_id)
+        if state is None or state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            return None
+        try:
+            return float(state.state)
+        except ValueError:
+            _LOGGER.warning("Power budget %s is not numeric: %s", self.entity_id, state.state)
+            return None
+
+    def _limits(self, coordinator: BitaxeDataUpdateCoordinator) -> FrequencyLimits:
+        """Return the frequency limits of a device, tracking manual changes."""
+        frequency = int(coordinator.data["frequency"])
+        limits = async_get_frequency_limits(
+            self.hass, coordinator.data["macAddr"], frequency
+        )
+        limits.observe(frequency, self.hass.loop.time())
+        return limits
+
+    def _is_settled(
+        self, coordinator: BitaxeDataUpdateCoordinator, limits: FrequencyLimits
+    ) -> bool:
+        """Return True once the last write has shown up in the device readings."""
+        settle_time = SETTLE_POLLS * coordinator.update_interval.total_seconds()
+        return (
+            not limits.pending
+            and self.hass.loop.time() - limits.last_write >= settle_time
+        )
+
+    async def _async_evaluate(self) -> None:
+        """Compare the fleet draw against the budget and adjust frequencies."""
+        budget = self._get_budget()
+        if budget is None:
+            return
+
+        devices: list[tuple[BitaxeDataUpdateCoordinator, FrequencyLimits]] = []
+        last_power: dict[BitaxeDataUpdateCoordinator, float] = {}
+        unknown = False
+        for coordinator in async_get_coordinators(self.hass):
+            if not coordinator.last_update_success or coordinator.failure_count:
+                # Unreachable, assume it still draws what it drew last
+                if coordinator in self._last_power:
+                    last_power[coordinator] = self._last_power[coordinator]
+                else:
+                    unknown = True
+            elif coordinator.data.get("power") and coordinator.data.get("frequency"):
+                last_power[coordinator] = coordinator.data["power"]
+                devices.append((coordinator, self._limits(coordinator)))
+        self._last_power = last_power
+        if not devices:
+            return
+
+        total = sum(last_power.values())
+
+        if total > budget:
+            changes = self._plan_shed(devices, total - budget)
+        elif total < budget - self.margin and not unknown:
+            changes = self._plan_restore(devices, budget - self.margin - total)
+        else:
+            return
+
+        await asyncio.gather(
+            *(
+                self._async_set_limit(coordinator, limits, limit)
+                for coordinator, limits, limit in changes
+            )
+        )
+
+    def _plan_shed(
+        self,
+        devices: list[tuple[BitaxeDataUpdateCoordinator, FrequencyLimits]],
+        excess: float,
+    ) -> list[tuple[BitaxeDataUpdateCoordinator, FrequencyLimits, int]]:
+        """Step down the least efficient devices until the excess is covered."""
+        changes = []
+        for coordinator, limits in sorted(
+            devices, key=lambda device: _watts_per_gigahash(device[0]), reverse=True
+        ):
+            if excess <= 0:
+                break
+            if not self._is_settled(coordinator, limits):
+                if limits.limit(CONF_POWER_BUDGET) is not None:
+                    # Reduction still settling, count it against the excess
+                    excess -= _step_power(coordinator)
+                continue
+
+            frequency = limits.target
+            step_power = _step_power(coordinator)
+            steps = min(math.ceil(excess / step_power), POWER_BUDGET_MAX_STEPS)
+            target = max(
+                frequency - steps * POWER_BUDGET_FREQUENCY_STEP,
+                POWER_BUDGET_MIN_FREQUENCY,
+            )
+            if target >= frequency:
+                continue
+
+            excess -= step_power * (frequency - target) / POWER_BUDGET_FREQUENCY_STEP
+            changes.append((coordinator, limits, target))
+
+        return changes
+
+    def _plan_restore(
+        self,
+        devices: list[tuple[BitaxeDataUpdateCoordinator, FrequencyLimits]],
+        headroom: float,
+    ) -> list[tuple[BitaxeDataUpdateCoordinator, FrequencyLimits, int]]:
+        """Step throttled devices back up, most efficient first."""
+        changes = []
+        for coordinator, limits in sorted(
+            devices, key=lambda device: _watts_per_gigahash(device[0])
+        ):
+            limit = limits.limit(CONF_POWER_BUDGET)
+            if limit is None or not self._is_settled(coordinator, limits):
+                continue
+
+            step_power = _step_power(coordinator)
+            steps = min(int(headroom // step_power), POWER_BUDGET_MAX_STEPS)
+            if steps <= 0:
+                break
+
+            # Raising the limit adds nothing while the thermal controller
+            # holds the device lower
+            limit += steps * POWER_BUDGET_FREQUENCY_STEP
+            target = limits.target_with(CONF_POWER_BUDGET, limit)
+            headroom -= (
+                step_power * (target - limits.target) / POWER_BUDGET_FREQUENCY_STEP
+            )
+            changes.append((coordinator, limits, limit))
+
+        return changes
+
+    async def _async_set_limit(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        limits: FrequencyLimits,
+        limit: int,
+    ) -> None:
+        """Change the limit of a device, writing the frequency if it changes."""
+        frequency = limits.target_with(CONF_POWER_BUDGET, limit)
+        if frequency == limits.target:
+            limits.set_limit(CONF_POWER_BUDGET, limit, self.hass.loop.time())
+            return
+
+        _LOGGER.info(
+            "Power budget: setting %s frequency to %d MHz (baseline %d MHz)",
+            coordinator.name,
+            frequency,
+            limits.baseline,
+        )
+        try:
+            await coordinator.api.update_settings(
+                {"frequency": frequency}, PRIORITY_CONTROL
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Failed to set frequency on %s: %s", coordinator.name, err)
+            return
+
+        limits.set_limit(CONF_POWER_BUDGET, limit, self.hass.loop.time())
+        await coordinator.async_request_refresh()
+
+
+def _watts_per_gigahash(coordinator: BitaxeDataUpdateCoordinator) -> float:
+    """Return the device efficiency, higher is worse."""
+    data = coordinator.data
+    hashrate = data.get("hashRate_10m") or data.get("hashRate") or 0
+    if hashrate <= 0:
+        return math.inf
+    return data["power"] / hashrate
+
+
+def _step_power(coordinator: BitaxeDataUpdateCoordinator) -> float:
+    """Estimate the power change of one frequency step.
+
+    Power scales roughly linearly with frequency at a fixed core voltage.
+    """
+    data = coordinator.data
+    return max(data["power"] * POWER_BUDGET_FREQUENCY_STEP / data["frequency"], 0.1)
@@ -0,0 +1,131 @@
+"""On-demand profiling for the Bitaxe integration."""
+from __future__ import annotations
+
+from collections import defaultdict
+import cProfile
+import io
+import pstats
+import time
+
+from .const import (
+    PROFILE_CPROFILE_LINES,
+    STAGE_API_IO,
+    STAGE_COORDINATOR,
+    STAGE_ENTITY_WRITE,
+    STAGE_FLEET,
+    STAGE_JSON_DECODE,
+    STAGE_QUEUE_WAIT,
+)
+
+STAGES = (
+    STAGE_QUEUE_WAIT,
+    STAGE_API_IO,
+    STAGE_JSON_DECODE,
+    STAGE_COORDINATOR,
+    STAGE_ENTITY_WRITE,
+    STAGE_FLEET,
+)
+
+
+class _Timing:
+    """Accumulated timing for one bucket."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add a measurement."""
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def row(self, label: str) -> str:
+        """Return a report line."""
+        mean = self.total / self.count if self.count else 0.0
+        return (
+            f"  {label:<40} {self.count:>8} {self.total * 1000:>12.2f}"
+            f" {mean * 1000:>10.3f} {self.max * 1000:>10.3f}"
+        )
+
+
+class BitaxeProfiler:
+    """Collect per-stage, per-device and per-entity-type timings.
+
+    Instrumented code only checks ``active`` while the profiler is idle, so
+    the hooks cost next to nothing outside a profiling run.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.active = False
+        self._started = 0.0
+        self._stages: dict[str, _Timing] = defaultdict(_Timing)
+        self._devices: dict[tuple[str, str], _Timing] = defaultdict(_Timing)
+        self._entity_types: dict[str, _Timing] = defaultdict(_Timing)
+        self._cprofile: cProfile.Profile | None = None
+
+    def start(self, use_cprofile: bool) -> None:
+        """Start collecting timings."""
+        self._stages.clear()
+        self._devices.clear()
+        self._entity_types.clear()
+        self._started = time.perf_counter()
+        if use_cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self.active = True
+
+    def stop(self) -> str:
+        """Stop collecting timings and return the report."""
+        self.active = False
+        elapsed = time.perf_counter() - self._started
+        profile, self._cprofile = self._cprofile, None
+        if profile is not None:
+            profile.disable()
+        return self._report(elapsed, profile)
+
+    def record(
+        self,
+        stage: str,
+        device: str,
+        duration: float,
+        entity_type: str | None = None,
+    ) -> None:
+        """Record the duration of a stage."""
+        self._stages[stage].add(duration)
+        self._devices[(device, stage)].add(duration)
+        if entity_type is not None:
+            self._entity_types[entity_type].add(duration)
+
+    def _report(self, elapsed: float, profile: cProfile.Profile | None) -> str:
+        """Render the collected timings as text."""
+        header = f"  {'':<40} {'calls':>8} {'total ms':>12} {'mean ms':>10} {'max ms':>10}"
+        lines = [f"Bitaxe profile over {elapsed:.1f} s", "", "Stages", header]
+        lines.extend(
+            self._stages[stage].row(stage) for stage in STAGES if stage in self._stages
+        )
+
+        lines.extend(["", "Devices", header])
+        for device, stage in sorted(self._devices):
+            lines.append(self._devices[(device, stage)].row(f"{device} / {stage}"))
+
+        lines.extend(["", "Entity types", header])
+        for entity_type, timing in sorted(
+            self._entity_types.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            lines.append(timing.row(entity_type))
+
+        if profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                PROFILE_CPROFILE_LINES
+            )
+            lines.extend(["", "cProfile", stream.getvalue()])
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,225 @@
+"""Host re-resolution for the Bitaxe integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import ipaddress
+import logging
+import socket
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    RESOLVE_AFTER_FAILURES,
+    RESOLVE_INTERVAL,
+    RESOLVE_MAX_PARALLEL,
+    RESOLVE_PROBE_TIMEOUT,
+    RESOLVE_SUBNET_PREFIX,
+)
+from .coordinator import BitaxeApiClient, BitaxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _same_mac(first: str | None, second: str | None) -> bool:
+    """Return True if two MAC addresses are equal, ignoring case."""
+    return first is not None and second is not None and first.upper() == second.upper()
+
+
+async def _async_probe(host: str, port: int, mac: str) -> bool:
+    """Return True if the device answering on a host has the given MAC."""
+    api = BitaxeApiClient(host, port, RESOLVE_PROBE_TIMEOUT)
+    try:
+        info = await api.get_system_info()
+    except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+        return False
+    return _same_mac(info.get("macAddr"), mac)
+
+
+async def _async_lookup_hostname(hass: HomeAssistant, hostname: str) -> list[str]:
+    """Return the IPv4 addresses the mDNS name of a device resolves to."""
+    try:
+        addresses = await hass.loop.getaddrinfo(
+            f"{hostname}.local", None, family=socket.AF_INET, type=socket.SOCK_STREAM
+        )
+    except OSError:
+        return []
+    return list(dict.fromkeys(address[4][0] for address in addresses))
+
+
+async def _async_probe_subnet(
+    network: ipaddress.IPv4Network, port: int, mac: str, skip: str
+) -> str | None:
+    """Probe every address of a subnet in parallel and return the one with the MAC.
+
+    At most ``RESOLVE_MAX_PARALLEL`` probes are in flight, and the remaining
+    probes are cancelled as soon as the device answers.
+    """
+    semaphore = asyncio.Semaphore(RESOLVE_MAX_PARALLEL)
+
+    async def _async_check(host: str) -> str | None:
+        async with semaphore:
+            return host if await _async_probe(host, port, mac) else None
+
+    tasks = [
+        asyncio.create_task(_async_check(str(address)))
+        for address in network.hosts()
+        if str(address) != skip
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            if host := await next_done:
+                return host
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None
+
+
+async def async_resolve_host(
+    hass: HomeAssistant,
+    mac: str,
+    port: int,
+    last_host: str,
+    hostname: str | None = None,
+) -> str | None:
+    """Find the current address of a device by its MAC address.
+
+    The mDNS name of the device is tried first. If it does not answer with
+    the expected MAC, the /24 around the last known IPv4 address is probed.
+    Returns None if the device could not be found.
+    """
+    if hostname:
+        for host in await _async_lookup_hostname(hass, hostname):
+            if host != last_host and await _async_probe(host, port, mac):
+                _LOGGER.debug("Found %s at %s via %s.local", mac, host, hostname)
+                return host
+
+    try:
+        network = ipaddress.ip_network(
+            f"{last_host}/{RESOLVE_SUBNET_PREFIX}", strict=False
+        )
+    except ValueError:
+        # The entry holds a hostname rather than an address, nothing to probe
+        return None
+    if not isinstance(network, ipaddress.IPv4Network):
+        return None
+
+    _LOGGER.debug("Probing %s for %s", network, mac)
+    return await _async_probe_subnet(network, port, mac, last_host)
+
+
+class BitaxeHostResolver:
+    """Follow a device to its new address when its DHCP lease changes.
+
+    The config entry is keyed on the device MAC. Once the coordinator has
+    failed ``RESOLVE_AFTER_FAILURES`` polls in a row, the device is looked
+    up by MAC in the background, and again every ``RESOLVE_INTERVAL`` until
+    a poll succeeds. The retries run on their own timer, since the
+    coordinator stops notifying its listeners while polls keep failing.
+    When the device is found on a new address the entry host is updated,
+    which reloads the entry against the new address.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: BitaxeDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the resolver."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self._unsub: CALLBACK_TYPE | None = None
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self._hostname: str | None = None
+        self._resolving = False
+
+    @callback
+    def async_start(self) -> None:
+        """Start watching the coordinator for failed polls."""
+        self._unsub = self.coordinator.async_add_listener(self._async_check)
+        self._async_check()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop watching the coordinator and retrying lookups."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._async_stop_retries()
+
+    @callback
+    def _async_stop_retries(self) -> None:
+        """Cancel the lookup retries."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    @callback
+    def _async_check(self) -> None:
+        """Start looking the device up once it has been unreachable for a while."""
+        if self.coordinator.failure_count == 0:
+            self._hostname = self.coordinator.data.get("hostname")
+            self._async_stop_retries()
+            return
+
+        if (
+            self.entry.unique_id is None
+            or self.coordinator.failure_count < RESOLVE_AFTER_FAILURES
+            or self._unsub_retry is not None
+        ):
+            return
+
+        self._unsub_retry = async_track_time_interval(
+            self.hass, self._async_retry, timedelta(seconds=RESOLVE_INTERVAL)
+        )
+        self._async_lookup()
+
+    @callback
+    def _async_retry(self, now: datetime) -> None:
+        """Look the device up again while it stays unreachable."""
+        if self.coordinator.failure_count == 0:
+            self._async_stop_retries()
+            return
+        self._async_lookup()
+
+    @callback
+    def _async_lookup(self) -> None:
+        """Start a lookup in the background unless one is running."""
+        if self._resolving:
+            return
+        self._resolving = True
+        self.hass.async_create_background_task(
+            self._async_resolve(), f"{self.coordinator.name} host resolution"
+        )
+
+    async def _async_resolve(self) -> None:
+        """Look the device up by MAC and point the entry at its new address."""
+        try:
+            host = await async_resolve_host(
+                self.hass,
+                self.entry.unique_id,
+                self.coordinator.api.port,
+                self.coordinator.api.host,
+                self._hostname,
+            )
+        finally:
+            self._resolving = False
+
+        if host is None:
+            _LOGGER.debug("%s was not found on the network", self.coordinator.name)
+            return
+
+        _LOGGER.info(
+            "%s moved from %s to %s", self.coordinator.name, self.coordinator.api.host, host
+        )
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, CONF_HOST: host}
+        )
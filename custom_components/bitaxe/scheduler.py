@@ -0,0 +1,143 @@
+"""Per-device request scheduling for the Bitaxe integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import heapq
+import itertools
+import time
+from typing import Any, TypeVar
+
+from .const import REQUEST_MAX_PARALLEL
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _PendingRead:
+    """A read waiting for a slot, shared by every reader of its path."""
+
+    priority: int
+    waiter: asyncio.Future[None]
+    result: asyncio.Future[Any]
+
+
+class RequestScheduler:
+    """Run the requests to one device a few at a time, most urgent first.
+
+    Requests wait for one of ``max_parallel`` slots; a freed slot goes to the
+    waiting request with the lowest priority value, in arrival order within
+    a priority. A read of a path that is already waiting shares the result
+    of the waiting read instead of queueing again, and moves the waiting
+    read up when it is more urgent. Reads that have already been sent are
+    not shared, so a read queued after a write always sees the write.
+    """
+
+    def __init__(self, max_parallel: int = REQUEST_MAX_PARALLEL) -> None:
+        """Initialize the scheduler."""
+        self._max_parallel = max_parallel
+        self._running = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._pending_reads: dict[str, _PendingRead] = {}
+
+    async def _acquire(
+        self, priority: int, waiter: asyncio.Future[None] | None = None
+    ) -> float:
+        """Wait for a slot and return how long the wait took.
+
+        The slot is handed over by resolving ``waiter``. The waiter may be
+        queued more than once; entries of a resolved waiter are skipped.
+        """
+        if self._running < self._max_parallel and not self._waiters:
+            self._running += 1
+            return 0.0
+
+        start = time.perf_counter()
+        if waiter is None:
+            waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+        return time.perf_counter() - start
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiting request, or free it."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+    async def run(
+        self, priority: int, request: Callable[[], Awaitable[_T]]
+    ) -> tuple[_T, float]:
+        """Run a request once a slot is free and return its result and wait."""
+        waited = await self._acquire(priority)
+        try:
+            return await request(), waited
+        finally:
+            self._release()
+
+    async def read(
+        self, path: str, priority: int, request: Callable[[], Awaitable[_T]]
+    ) -> tuple[_T, float]:
+        """Run a read, sharing the result with an identical read still waiting.
+
+        A shared read waits in the place of the read it joined, which is
+        queued again at the joining priority when that is more urgent. If the
+        reader that queued the read is cancelled, the readers that joined it
+        read again on their own, and collapse onto the first of them.
+        """
+        joined = 0.0
+        while (pending := self._pending_reads.get(path)) is not None:
+            if priority < pending.priority and not pending.waiter.done():
+                pending.priority = priority
+                heapq.heappush(
+                    self._waiters, (priority, next(self._order), pending.waiter)
+                )
+            start = time.perf_counter()
+            try:
+                result = await asyncio.shield(pending.result)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not pending.result.cancelled() or (task and task.cancelling()):
+                    raise
+                # Only the reader that queued the read was cancelled
+                joined += time.perf_counter() - start
+                continue
+            return result, joined + time.perf_counter() - start
+
+        loop = asyncio.get_running_loop()
+        pending = _PendingRead(priority, loop.create_future(), loop.create_future())
+        future = pending.result
+        self._pending_reads[path] = pending
+        try:
+            waited = joined + await self._acquire(priority, pending.waiter)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        finally:
+            del self._pending_reads[path]
+
+        try:
+            result = await request()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Only readers that joined need the error; don't log it as unretrieved
+            future.exception()
+            raise
+        finally:
+            self._release()
+        future.set_result(result)
+        return result, waited
@@ -1,6 +1,8 @@
 """Sensor platform for Bitaxe integration."""
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -11,6 +13,7 @@ from homeassistant.const import (
     PERCENTAGE,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
+    UnitOfEnergy,
     UnitOfInformation,
     UnitOfPower,
     UnitOfTemperature,
@@ -18,12 +21,23 @@ from homeassistant.const import (
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, GIGA_HASH_PER_SECOND
+from .const import (
+    DATA_ANALYTICS,
+    DOMAIN,
+    GIGA_HASH_PER_SECOND,
+    JOULES_PER_TERAHASH,
+    POOL_FALLBACK,
+    POOL_PRIMARY,
+    SHARES_PER_MINUTE,
+    SIGNAL_ANALYTICS_UPDATE,
+)
 from .coordinator import BitaxeDataUpdateCoordinator
+from .snapshot import parse_difficulty
 
 
 async def async_setup_entry(
@@ -40,12 +54,20 @@ async def async_setup_entry(
         BitaxeHashrateSensor(coordinator, "hashRate_1m", "Hashrate (1m avg)"),
         BitaxeHashrateSensor(coordinator, "hashRate_10m", "Hashrate (10m avg)"),
         BitaxeHashrateSensor(coordinator, "hashRate_1h", "Hashrate (1h avg)"),
+        BitaxeHashrateSensor(coordinator, "expectedHashrate", "Expected Hashrate"),
+        BitaxePercentageSensor(coordinator, "hashrateEfficiency", "Hashrate Efficiency"),
         BitaxeSharesSensor(coordinator, "sharesAccepted", "Shares Accepted"),
         BitaxeSharesSensor(coordinator, "sharesRejected", "Shares Rejected"),
+        BitaxeShareRateSensor(coordinator, "sharesPerMinute_5m", "Shares per Minute (5m)"),
+        BitaxeShareRateSensor(coordinator, "sharesPerMinute_1h", "Shares per Minute (1h)"),
+        BitaxePercentageSensor(coordinator, "rejectRate_5m", "Reject Rate (5m)"),
+        BitaxePercentageSensor(coordinator, "rejectRate_1h", "Reject Rate (1h)"),
         BitaxePercentageSensor(coordinator, "errorPercentage", "Error Rate"),
         BitaxeDifficultySensor(coordinator, "poolDifficulty", "Pool Difficulty"),
         BitaxeDifficultySensor(coordinator, "bestDiff", "Best Difficulty"),
         BitaxeDifficultySensor(coordinator, "bestSessionDiff", "Best Session Difficulty"),
+        BitaxePoolSensor(coordinator, "pool", "Pool"),
+        BitaxeAnomalySensor(coordinator, "anomalyScore", "Anomaly Score"),
         
         # Hardware metrics
         BitaxeTemperatureSensor(coordinator, "temp", "Chip Temperature"),
@@ -53,6 +75,8 @@ async def async_setup_entry(
         BitaxeVoltageSensor(coordinator, "voltage", "Input Voltage"),
         BitaxeVoltageSensor(coordinator, "coreVoltageActual", "Core Voltage"),
         BitaxePowerSensor(coordinator, "power", "Power"),
+        BitaxeEnergySensor(coordinator, "energy", "Energy"),
+        BitaxeEfficiencySensor(coordinator, "efficiency", "Efficiency"),
         BitaxeCurrentSensor(coordinator, "current", "Current"),
         BitaxePercentageSensor(coordinator, "fanspeed", "Fan Speed"),
         BitaxeFanRpmSensor(coordinator, "fanrpm", "Fan RPM"),
@@ -120,6 +144,14 @@ class BitaxeSharesSensor(BitaxeSensorBase):
     _attr_icon = "mdi:counter"
 
 
+class BitaxeShareRateSensor(BitaxeSensorBase):
+    """Share rate sensor."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = SHARES_PER_MINUTE
+    _attr_icon = "mdi:speedometer"
+
+
 class BitaxeDifficultySensor(BitaxeSensorBase):
     """Difficulty sensor."""
 
@@ -129,34 +161,68 @@ class BitaxeDifficultySensor(BitaxeSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor, converting string difficulty to float."""
-        value = self.coordinator.data.get(self._key)
-        if value is None:
+        return parse_difficulty(self.coordinator.data.get(self._key))
+
+
+class BitaxePoolSensor(BitaxeSensorBase):
+    """Active pool sensor."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [POOL_PRIMARY, POOL_FALLBACK]
+    _attr_icon = "mdi:server-network"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the URL and user of the active pool."""
+        prefix = "fallbackStratum" if self.native_value == POOL_FALLBACK else "stratum"
+        url = self.coordinator.data.get(f"{prefix}URL")
+        port = self.coordinator.data.get(f"{prefix}Port")
+        return {
+            "url": f"{url}:{port}" if url and port else url,
+            "user": self.coordinator.data.get(f"{prefix}User"),
+        }
+
+
+class BitaxeAnomalySensor(BitaxeSensorBase):
+    """Anomaly score of the device against devices of the same ASIC model."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-bell-curve"
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to fleet analytics updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_ANALYTICS_UPDATE, self.async_write_ha_state
+            )
+        )
+
+    @property
+    def _anomaly(self):
+        """Return the latest anomaly of the device, if scored."""
+        analytics = self.hass.data[DOMAIN].get(DATA_ANALYTICS)
+        if analytics is None:
             return None
-        
-        # Handle string values like "39.2G", "27.4M", "1.5K"
-        if isinstance(value, str):
-            multipliers = {
-                'K': 1_000,
-                'M': 1_000_000,
-                'G': 1_000_000_000,
-                'T': 1_000_000_000_000,
-            }
-            
-            # Try to extract the numeric part and suffix
-            value_str = value.strip()
-            if value_str and value_str[-1] in multipliers:
-                try:
-                    number = float(value_str[:-1])
-                    return number * multipliers[value_str[-1]]
-                except ValueError:
-                    return None
-            else:
-                try:
-                    return float(value_str)
-                except ValueError:
-                    return None
-        
-        return value
+        return analytics.anomalies.get(self.coordinator.data.get("macAddr"))
+
+    @property
+    def native_value(self):
+        """Return the anomaly score."""
+        anomaly = self._anomaly
+        return anomaly.score if anomaly else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the peer count and the score of every metric."""
+        anomaly = self._anomaly
+        if anomaly is None:
+            return {}
+        return {
+            "outlier": anomaly.outlier,
+            "peers": anomaly.peers,
+            **anomaly.z_scores,
+        }
 
 
 class BitaxePercentageSensor(BitaxeSensorBase):
@@ -191,6 +257,22 @@ class BitaxePowerSensor(BitaxeSensorBase):
     _attr_native_unit_of_measurement = UnitOfPower.WATT
 
 
+class BitaxeEnergySensor(BitaxeSensorBase):
+    """Energy sensor."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+
+class BitaxeEfficiencySensor(BitaxeSensorBase):
+    """Efficiency sensor."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = JOULES_PER_TERAHASH
+    _attr_icon = "mdi:leaf"
+
+
 class BitaxeCurrentSensor(BitaxeSensorBase):
     """Current sensor."""
 
@@ -0,0 +1,240 @@
+"""Services for the Bitaxe integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.const import CONF_PORT, CONF_SCAN_INTERVAL
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_BATCH_SIZE,
+    ATTR_CANARY_SIZE,
+    ATTR_CPROFILE,
+    ATTR_DEVICE_ID,
+    ATTR_DURATION,
+    ATTR_HOSTS,
+    ATTR_MAX_FAILURES,
+    ATTR_TIMEOUT,
+    CONF_FIRMWARE,
+    DATA_PROFILER,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CAPTURE_DURATION,
+    DEFAULT_CANARY_SIZE,
+    DEFAULT_MAX_FAILURES,
+    DEFAULT_PORT,
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_ROLLOUT_BATCH_SIZE,
+    DEFAULT_RESTART_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SERVICE_CAPTURE,
+    SERVICE_FIRMWARE_ROLLOUT,
+    SERVICE_IMPORT_HOSTS,
+    SERVICE_PROFILE,
+    SERVICE_ROLLING_RESTART,
+)
+from .fleet import (
+    async_firmware_rollout,
+    async_get_coordinators,
+    async_rolling_restart,
+)
+from .capture import capture_path
+from .importer import async_import_hosts
+
+_LOGGER = logging.getLogger(__name__)
+
+ROLLING_RESTART_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_BATCH_SIZE, default=DEFAULT_BATCH_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_RESTART_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=30, max=3600)
+        ),
+        vol.Optional(ATTR_MAX_FAILURES, default=DEFAULT_MAX_FAILURES): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+    }
+)
+
+FIRMWARE_ROLLOUT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CANARY_SIZE, default=DEFAULT_CANARY_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_BATCH_SIZE, default=DEFAULT_ROLLOUT_BATCH_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_MAX_FAILURES, default=DEFAULT_MAX_FAILURES): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=3600)
+        ),
+        vol.Optional(ATTR_CPROFILE, default=False): cv.boolean,
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DURATION, default=DEFAULT_CAPTURE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=86400)
+        ),
+    }
+)
+
+IMPORT_HOSTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_HOSTS): vol.All(
+            cv.ensure_list_csv, [cv.string], vol.Length(min=1)
+        ),
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=300)
+        ),
+    }
+)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Bitaxe services."""
+
+    async def async_handle_rolling_restart(call: ServiceCall) -> None:
+        """Restart the selected devices batch by batch."""
+        coordinators = async_get_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+        if not coordinators:
+            raise HomeAssistantError("No Bitaxe devices to restart")
+
+        await async_rolling_restart(
+            coordinators,
+            call.data[ATTR_BATCH_SIZE],
+            call.data[ATTR_TIMEOUT],
+            call.data[ATTR_MAX_FAILURES],
+        )
+
+    async def async_handle_firmware_rollout(call: ServiceCall) -> None:
+        """Install the staged firmware on the selected devices in stages."""
+        manager = hass.data[DOMAIN].get(CONF_FIRMWARE)
+        if manager is None:
+            raise HomeAssistantError("No firmware is configured for Bitaxe devices")
+
+        coordinators = async_get_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+        if not coordinators:
+            raise HomeAssistantError("No Bitaxe devices to update")
+
+        await async_firmware_rollout(
+            manager,
+            coordinators,
+            call.data[ATTR_CANARY_SIZE],
+            call.data[ATTR_BATCH_SIZE],
+            call.data[ATTR_MAX_FAILURES],
+        )
+
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Collect timings for a while and write a report file."""
+        profiler = hass.data[DOMAIN][DATA_PROFILER]
+        if profiler.active:
+            raise HomeAssistantError("A Bitaxe profile is already running")
+
+        profiler.start(call.data[ATTR_CPROFILE])
+        try:
+            await asyncio.sleep(call.data[ATTR_DURATION])
+        finally:
+            report = profiler.stop()
+
+        path = hass.config.path(
+            f"bitaxe_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        await hass.async_add_executor_job(Path(path).write_text, report)
+        _LOGGER.info("Bitaxe profile written to %s", path)
+        return {"path": path}
+
+    async def async_handle_capture(call: ServiceCall) -> ServiceResponse:
+        """Record every response of the selected devices for a while."""
+        coordinators = async_get_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+        if not coordinators:
+            raise HomeAssistantError("No Bitaxe devices to capture")
+        if busy := [c.name for c in coordinators if c.capture is not None]:
+            raise HomeAssistantError(f"Already capturing {', '.join(busy)}")
+
+        paths = []
+        try:
+            for coordinator in coordinators:
+                path = capture_path(hass, coordinator.data["macAddr"])
+                await coordinator.async_start_capture(path)
+                paths.append(path)
+            await asyncio.sleep(call.data[ATTR_DURATION])
+        finally:
+            await asyncio.gather(
+                *(coordinator.async_stop_capture() for coordinator in coordinators)
+            )
+
+        _LOGGER.info("Bitaxe captures written to %s", ", ".join(paths))
+        return {"paths": paths}
+
+    async def async_handle_import_hosts(call: ServiceCall) -> ServiceResponse:
+        """Validate a list of hosts and add every new device."""
+        return await async_import_hosts(
+            hass,
+            call.data[ATTR_HOSTS],
+            call.data[CONF_PORT],
+            call.data[CONF_SCAN_INTERVAL],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ROLLING_RESTART,
+        async_handle_rolling_restart,
+        schema=ROLLING_RESTART_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIRMWARE_ROLLOUT,
+        async_handle_firmware_rollout,
+        schema=FIRMWARE_ROLLOUT_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE,
+        async_handle_capture,
+        schema=CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HOSTS,
+        async_handle_import_hosts,
+        schema=IMPORT_HOSTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,76 @@
+"""Windowed share statistics for the Bitaxe integration."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from .const import SHARE_RATE_WINDOWS
+
+
+class ShareRateTracker:
+    """Derive share rates from the device's accepted and rejected counters.
+
+    The device counters restart from zero on every reboot. A reset is
+    detected from a drop in ``uptimeSeconds`` or in either counter, and the
+    counts seen before the reset are carried as an offset so the tracked
+    totals keep increasing across reboots.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._samples: deque[tuple[float, int, int]] = deque()
+        self._max_window = max(SHARE_RATE_WINDOWS.values())
+        self._last_raw: tuple[int, int, int] | None = None
+        self._accepted_offset = 0
+        self._rejected_offset = 0
+
+    def update(self, now: float, data: dict[str, Any]) -> dict[str, float | None]:
+        """Add a sample and return the windowed rates keyed by data key."""
+        accepted = int(data.get("sharesAccepted") or 0)
+        rejected = int(data.get("sharesRejected") or 0)
+        uptime = int(data.get("uptimeSeconds") or 0)
+
+        if self._last_raw is not None:
+            last_accepted, last_rejected, last_uptime = self._last_raw
+            if uptime < last_uptime or accepted < last_accepted or rejected < last_rejected:
+                self._accepted_offset += last_accepted
+                self._rejected_offset += last_rejected
+        self._last_raw = (accepted, rejected, uptime)
+
+        self._samples.append(
+            (now, accepted + self._accepted_offset, rejected + self._rejected_offset)
+        )
+        # Keep the newest sample from before the longest window as its anchor
+        while len(self._samples) > 1 and self._samples[1][0] <= now - self._max_window:
+            self._samples.popleft()
+
+        rates: dict[str, float | None] = {}
+        for suffix, window in SHARE_RATE_WINDOWS.items():
+            per_minute, reject_rate = self._rates(now - window)
+            rates[f"sharesPerMinute_{suffix}"] = per_minute
+            rates[f"rejectRate_{suffix}"] = reject_rate
+        return rates
+
+    def _rates(self, since: float) -> tuple[float | None, float | None]:
+        """Return shares per minute and reject percentage since a point in time.
+
+        The rates are taken from the newest sample at or before ``since``, so
+        a window still has two samples when polls are further apart than the
+        window itself. Before there is such a sample the oldest one is used.
+        """
+        first = self._samples[0]
+        for sample in self._samples:
+            if sample[0] > since:
+                break
+            first = sample
+        last = self._samples[-1]
+        elapsed = last[0] - first[0]
+        if elapsed <= 0:
+            return None, None
+
+        accepted = last[1] - first[1]
+        rejected = last[2] - first[2]
+        per_minute = round(accepted * 60 / elapsed, 2)
+        total = accepted + rejected
+        reject_rate = round(rejected * 100 / total, 2) if total else None
+        return per_minute, reject_rate
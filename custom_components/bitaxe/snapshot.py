@@ -0,0 +1,44 @@
+"""Compact device snapshots for the Bitaxe integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import SNAPSHOT_FIELDS
+from .coordinator import BitaxeDataUpdateCoordinator
+
+_DIFFICULTY_SUFFIXES = {
+    "K": 1_000,
+    "M": 1_000_000,
+    "G": 1_000_000_000,
+    "T": 1_000_000_000_000,
+}
+_DIFFICULTY_FIELDS = {"bestDiff", "bestSessionDiff", "poolDifficulty"}
+
+
+def parse_difficulty(value: Any) -> float | None:
+    """Convert a difficulty to a number, including strings like "39.2G"."""
+    if not isinstance(value, str):
+        return value
+
+    value = value.strip()
+    multiplier = 1
+    if value and value[-1] in _DIFFICULTY_SUFFIXES:
+        value, multiplier = value[:-1], _DIFFICULTY_SUFFIXES[value[-1]]
+    try:
+        return float(value) * multiplier
+    except ValueError:
+        return None
+
+
+def device_snapshot(coordinator: BitaxeDataUpdateCoordinator) -> list[Any] | None:
+    """Return the values of ``SNAPSHOT_FIELDS``, or None while the device is down."""
+    if not coordinator.last_update_success or coordinator.failure_count:
+        # The data is placeholder data until the device answers again
+        return None
+    data = coordinator.data
+    return [
+        parse_difficulty(data.get(field))
+        if field in _DIFFICULTY_FIELDS
+        else data.get(field)
+        for field in SNAPSHOT_FIELDS
+    ]
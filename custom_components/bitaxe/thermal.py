@@ -0,0 +1,231 @@
+"""Local thermal control loop for the Bitaxe integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_THERMAL_CONTROL,
+    PRIORITY_CONTROL,
+    THERMAL_FAN_MIN_DELTA,
+    THERMAL_FAN_WRITE_INTERVAL,
+    THERMAL_FREQUENCY_MARGIN,
+    THERMAL_FREQUENCY_STEP,
+    THERMAL_FREQUENCY_WRITE_INTERVAL,
+    THERMAL_KD,
+    THERMAL_KI,
+    THERMAL_KP,
+    THERMAL_MIN_FAN,
+    THERMAL_MIN_FREQUENCY,
+    THERMAL_RESTORE_MARGIN,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+from .frequency import FrequencyLimits, async_get_frequency_limits
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BitaxeThermalController:
+    """Hold chip and VR temperature at a target using fan speed, then frequency.
+
+    The controller polls the device on its own cadence, independent of the
+    coordinator scan interval. A PID loop drives the manual fan speed; when
+    the fan is saturated and the device is still too hot, frequency is
+    stepped down and later restored once there is enough thermal headroom.
+    The frequency limit is kept in the device's shared ``FrequencyLimits``,
+    next to the one of the power budget controller. Writes are rate limited
+    so the device web server is not flooded. Stopping the controller hands
+    the fan back to the device and lifts its frequency limit.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: BitaxeDataUpdateCoordinator,
+        target_temp: float,
+        target_vr_temp: float,
+        interval: int,
+    ) -> None:
+        """Initialize the controller."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.target_temp = target_temp
+        self.target_vr_temp = target_vr_temp
+        self.interval = interval
+
+        self._unsub: CALLBACK_TYPE | None = None
+        self._running = False
+        self._took_fan_control = False
+
+        self._integral = 0.0
+        self._prev_error: float | None = None
+        self._prev_time: float | None = None
+
+        self._last_fan_write = float("-inf")
+        self._last_frequency_write = float("-inf")
+        self._limits: FrequencyLimits | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the control loop."""
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_tick, timedelta(seconds=self.interval)
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the control loop and hand fan and frequency back to the device."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self.hass.async_create_task(self._async_release())
+
+    async def _async_release(self) -> None:
+        """Return fan control to the device and lift the frequency limit."""
+        if self._took_fan_control:
+            self._took_fan_control = False
+            await self._async_write({"autofanspeed": 1})
+
+        limits = self._limits
+        if limits is None or limits.limit(CONF_THERMAL_CONTROL) is None:
+            return
+        now = self.hass.loop.time()
+        target = limits.target_with(CONF_THERMAL_CONTROL, None)
+        if target == limits.target:
+            # The power budget holds the device at least as low
+            limits.set_limit(CONF_THERMAL_CONTROL, None, now)
+            return
+
+        _LOGGER.info(
+            "Thermal control stopped: restoring %s frequency to %d MHz",
+            self.coordinator.name,
+            target,
+        )
+        # On failure the limit is kept, so the device is not left below a
+        # baseline nobody restores
+        if await self._async_write({"frequency": target}):
+            limits.set_limit(CONF_THERMAL_CONTROL, None, now)
+
+    async def _async_tick(self, now: datetime) -> None:
+        """Run one control step."""
+        if self._running:
+            # Previous step is still waiting on the device
+            return
+        self._running = True
+        try:
+            await self._async_step()
+        finally:
+            self._running = False
+
+    async def _async_step(self) -> None:
+        """Read the device and adjust fan speed and frequency."""
+        try:
+            data = await self.coordinator.api.get_system_info(PRIORITY_CONTROL)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Thermal control read from %s failed: %s", self.coordinator.name, err)
+            return
+
+        temp = data.get("temp")
+        vr_temp = data.get("vrTemp")
+        fanspeed = data.get("fanspeed")
+        frequency = data.get("frequency")
+        if temp is None or fanspeed is None or frequency is None:
+            return
+
+        if data.get("autofanspeed"):
+            if not await self._async_write({"autofanspeed": 0}):
+                return
+            self._took_fan_control = True
+
+        error = temp - self.target_temp
+        if vr_temp:
+            error = max(error, vr_temp - self.target_vr_temp)
+
+        now = self.hass.loop.time()
+        output = self._pid(error, now, fanspeed)
+        fan = int(round(min(max(output, THERMAL_MIN_FAN), 100)))
+
+        if (
+            abs(fan - fanspeed) >= THERMAL_FAN_MIN_DELTA
+            and now - self._last_fan_write >= THERMAL_FAN_WRITE_INTERVAL
+        ):
+            if await self._async_write({"fanspeed": fan}):
+                self._last_fan_write = now
+
+        await self._async_adjust_frequency(
+            error, output, data["macAddr"], int(frequency), now
+        )
+
+    def _pid(self, error: float, now: float, fanspeed: float) -> float:
+        """Return the PID output as a fan percentage."""
+        if self._prev_time is None:
+            # Bumpless start from the current fan speed
+            self._integral = fanspeed / THERMAL_KI
+            self._prev_error = error
+            self._prev_time = now
+
+        dt = max(now - self._prev_time, 1e-3)
+        derivative = (error - self._prev_error) / dt
+
+        integral = self._integral + error * dt
+        output = THERMAL_KP * error + THERMAL_KI * integral + THERMAL_KD * derivative
+
+        # Anti-windup: only integrate while the output is not saturated
+        if THERMAL_MIN_FAN < output < 100 or (output >= 100) != (error > 0):
+            self._integral = min(max(integral, 0.0), 100 / THERMAL_KI)
+
+        self._prev_error = error
+        self._prev_time = now
+        return output
+
+    async def _async_adjust_frequency(
+        self, error: float, output: float, mac: str, frequency: int, now: float
+    ) -> None:
+        """Step frequency when the fan alone cannot hold the target."""
+        limits = self._limits = async_get_frequency_limits(self.hass, mac, frequency)
+        limits.observe(frequency, now)
+        if now - self._last_frequency_write < THERMAL_FREQUENCY_WRITE_INTERVAL:
+            return
+
+        limit = limits.limit(CONF_THERMAL_CONTROL)
+        if output >= 100 and error > THERMAL_FREQUENCY_MARGIN:
+            limit = max(limits.target - THERMAL_FREQUENCY_STEP, THERMAL_MIN_FREQUENCY)
+        elif error < -THERMAL_RESTORE_MARGIN and output < 100 and limit is not None:
+            limit += THERMAL_FREQUENCY_STEP
+        else:
+            return
+
+        target = limits.target_with(CONF_THERMAL_CONTROL, limit)
+        if target == limits.target:
+            # At the minimum, or the power budget holds the device lower
+            limits.set_limit(CONF_THERMAL_CONTROL, limit, now)
+            return
+
+        _LOGGER.info(
+            "Thermal control: setting %s frequency to %d MHz (error %.1f °C)",
+            self.coordinator.name,
+            target,
+            error,
+        )
+        if await self._async_write({"frequency": target}):
+            self._last_frequency_write = now
+            limits.set_limit(CONF_THERMAL_CONTROL, limit, now)
+            await self.coordinator.async_request_refresh()
+
+    async def _async_write(self, settings: dict[str, Any]) -> bool:
+        """Write settings to the device."""
+        try:
+            await self.coordinator.api.update_settings(settings, PRIORITY_CONTROL)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error(
+                "Thermal control failed to update %s on %s: %s",
+                settings,
+                self.coordinator.name,
+                err,
+            )
+            return False
+        return True
@@ -0,0 +1,113 @@
+"""Update platform for Bitaxe integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.update import UpdateEntity, UpdateEntityFeature
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_FIRMWARE, DOMAIN, SIGNAL_FIRMWARE_PROGRESS
+from .coordinator import BitaxeDataUpdateCoordinator
+from .firmware import BitaxeFirmwareManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Bitaxe update entities from a config entry."""
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    manager: BitaxeFirmwareManager | None = hass.data[DOMAIN].get(CONF_FIRMWARE)
+
+    async_add_entities([BitaxeFirmwareUpdate(coordinator, manager)])
+
+
+class BitaxeFirmwareUpdate(CoordinatorEntity, UpdateEntity):
+    """Firmware update entity."""
+
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_supported_features = (
+        UpdateEntityFeature.INSTALL | UpdateEntityFeature.PROGRESS
+    )
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        manager: BitaxeFirmwareManager | None,
+    ) -> None:
+        """Initialize the update entity."""
+        super().__init__(coordinator)
+        self._manager = manager
+        self._attr_name = "Firmware"
+        self._attr_unique_id = f"{coordinator.data.get('macAddr', 'unknown')}_firmware"
+        self._attr_has_entity_name = True
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.data.get("macAddr", "unknown"))},
+            name=self.coordinator.name,
+            manufacturer="Bitaxe",
+            model=self.coordinator.data.get("ASICModel", "Unknown"),
+            sw_version=self.coordinator.data.get("version", "Unknown"),
+            configuration_url=f"http://{self.coordinator.data.get('ip', '')}",
+        )
+
+    @property
+    def installed_version(self) -> str | None:
+        """Return the firmware version running on the device."""
+        return self.coordinator.data.get("version")
+
+    @property
+    def latest_version(self) -> str | None:
+        """Return the staged firmware version."""
+        if self._manager is None:
+            return self.installed_version
+        return self._manager.image.version
+
+    @property
+    def in_progress(self) -> bool | int | None:
+        """Return the upload progress in percent."""
+        if self._manager is None:
+            return False
+        return self._manager.progress.get(
+            self.coordinator.data.get("macAddr"), False
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to install progress."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_FIRMWARE_PROGRESS, self._async_progress_updated
+            )
+        )
+
+    @callback
+    def _async_progress_updated(self, mac: str) -> None:
+        """Write the state when this device's install progress changes."""
+        if mac == self.coordinator.data.get("macAddr"):
+            self.async_write_ha_state()
+
+    async def async_install(
+        self, version: str | None, backup: bool, **kwargs: Any
+    ) -> None:
+        """Install the staged firmware."""
+        if self._manager is None:
+            raise HomeAssistantError("No firmware is configured for Bitaxe devices")
+
+        if not await self._manager.async_install(self.coordinator):
+            raise HomeAssistantError(
+                f"Failed to update {self.coordinator.name} to {self._manager.image.version}"
+            )
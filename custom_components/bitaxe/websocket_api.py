@@ -0,0 +1,208 @@
+"""Websocket API for the Bitaxe integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_DEVICE_ID,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_HISTORY_POINTS,
+    DOMAIN,
+    HISTORY_FIELDS,
+    HISTORY_MAX_HOURS,
+    HISTORY_MAX_POINTS,
+    SIGNAL_COORDINATOR_UPDATE,
+    SNAPSHOT_FIELDS,
+    SNAPSHOT_PUSH_DELAY,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+from .fleet import async_get_coordinators
+from .snapshot import device_snapshot
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the Bitaxe websocket commands."""
+    websocket_api.async_register_command(hass, websocket_history)
+    websocket_api.async_register_command(hass, websocket_fleet)
+    websocket_api.async_register_command(hass, websocket_subscribe_fleet)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required(ATTR_DEVICE_ID): str,
+        vol.Optional("hours", default=DEFAULT_HISTORY_HOURS): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False, max=HISTORY_MAX_HOURS)
+        ),
+        vol.Optional("points", default=DEFAULT_HISTORY_POINTS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_MAX_POINTS)
+        ),
+    }
+)
+@websocket_api.async_response
+async def websocket_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the downsampled sparkline history of a device.
+
+    The samples come from the ring file the coordinator appends to on every
+    poll, so the recorder database is not queried.
+    """
+    try:
+        coordinators = async_get_coordinators(hass, [msg[ATTR_DEVICE_ID]])
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+    if not coordinators:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Device is not loaded"
+        )
+        return
+
+    points: list[list[float | None]] = []
+    if (history := coordinators[0].history) is not None:
+        since = dt_util.utcnow().timestamp() - msg["hours"] * 3600
+        points = await hass.async_add_executor_job(history.read, since, msg["points"])
+
+    connection.send_result(
+        msg["id"], {"fields": ["timestamp", *HISTORY_FIELDS], "points": points}
+    )
+
+
+@callback
+def _async_fleet_devices(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Return the snapshot of every loaded device, keyed by device id."""
+    registry = dr.async_get(hass)
+    devices: dict[str, dict[str, Any]] = {}
+    for coordinator in async_get_coordinators(hass):
+        entry = coordinator.config_entry
+        if entry is None or entry.unique_id is None:
+            continue
+        device = registry.async_get_device(identifiers={(DOMAIN, entry.unique_id)})
+        if device is None:
+            # Platforms are not set up yet
+            continue
+        values = device_snapshot(coordinator)
+        devices[device.id] = {
+            "name": entry.title,
+            "mac": entry.unique_id,
+            "model": device.model,
+            "available": values is not None,
+            "values": values or [None] * len(SNAPSHOT_FIELDS),
+        }
+    return devices
+
+
+@websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/fleet"})
+@callback
+def websocket_fleet(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the latest snapshot of every device in one message.
+
+    Values are lists in the order of ``fields``, so a fleet of hundreds of
+    devices fits in a single compact message.
+    """
+    connection.send_result(
+        msg["id"],
+        {"fields": list(SNAPSHOT_FIELDS), "devices": _async_fleet_devices(hass)},
+    )
+
+
+def _diff(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Return the changed fields of a device snapshot, keyed by field name."""
+    changes = {
+        key: new[key] for key in ("name", "model", "available") if new[key] != old[key]
+    }
+    changes.update(
+        (field, value)
+        for field, value, previous in zip(SNAPSHOT_FIELDS, new["values"], old["values"])
+        if value != previous
+    )
+    return changes
+
+
+@websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/fleet/subscribe"})
+@callback
+def websocket_subscribe_fleet(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Push the fleet snapshot, then only what changed after each poll.
+
+    The first event adds every device. Later events carry ``added`` devices
+    in full, ``changed`` fields keyed by device id and field name, and
+    ``removed`` device ids. Polls that complete within
+    ``SNAPSHOT_PUSH_DELAY`` of each other are sent as one event, and polls
+    that changed nothing send no event at all.
+    """
+    sent = _async_fleet_devices(hass)
+    cancel_push: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_push(_now: Any) -> None:
+        nonlocal sent, cancel_push
+        cancel_push = None
+        devices = _async_fleet_devices(hass)
+        event: dict[str, Any] = {
+            "added": {
+                device_id: device
+                for device_id, device in devices.items()
+                if device_id not in sent
+            },
+            "changed": {
+                device_id: changes
+                for device_id, device in devices.items()
+                if device_id in sent and (changes := _diff(sent[device_id], device))
+            },
+            "removed": [device_id for device_id in sent if device_id not in devices],
+        }
+        sent = devices
+        if any(event.values()):
+            connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    @callback
+    def _async_coordinator_updated(coordinator: BitaxeDataUpdateCoordinator) -> None:
+        nonlocal cancel_push
+        if cancel_push is None:
+            cancel_push = async_call_later(hass, SNAPSHOT_PUSH_DELAY, _async_push)
+
+    unsub_dispatcher = async_dispatcher_connect(
+        hass, SIGNAL_COORDINATOR_UPDATE, _async_coordinator_updated
+    )
+
+    @callback
+    def _async_unsubscribe() -> None:
+        unsub_dispatcher()
+        if cancel_push is not None:
+            cancel_push()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "fields": list(SNAPSHOT_FIELDS),
+                "added": sent,
+                "changed": {},
+                "removed": [],
+            },
+        )
+    )
@@ -0,0 +1,307 @@
+"""Fixtures for Bitaxe integration tests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator, Iterator
+import copy
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.bitaxe.const import (
+    API_SYSTEM_ASIC,
+    API_SYSTEM_INFO,
+    DOMAIN,
+    PRIORITY_POLL,
+    PRIORITY_USER,
+)
+
+SYSTEM_INFO = {
+    "ASICModel": "BM1366",
+    "macAddr": "AA:BB:CC:DD:EE:01",
+    "hostname": "bitaxe",
+    "ipv4": "192.168.1.50",
+    "version": "v2.4.0",
+    "temp": 55.5,
+    "vrTemp": 60,
+    "hashRate": 500.0,
+    "hashRate_1m": 498.0,
+    "hashRate_10m": 495.0,
+    "hashRate_1h": 492.0,
+    "power": 12.5,
+    "voltage": 5100,
+    "current": 2500,
+    "coreVoltage": 1200,
+    "coreVoltageActual": 1195,
+    "frequency": 500,
+    "fanspeed": 60,
+    "fanrpm": 4200,
+    "autofanspeed": 1,
+    "overclockEnabled": 0,
+    "invertscreen": 0,
+    "rotation": 0,
+    "temptarget": 60,
+    "displayTimeout": -1,
+    "statsFrequency": 120,
+    "sharesAccepted": 1000,
+    "sharesRejected": 5,
+    "errorPercentage": 0.5,
+    "poolDifficulty": 1000,
+    "stratumURL": "public-pool.io",
+    "stratumPort": 21496,
+    "stratumUser": "bc1qexample.bitaxe",
+    "fallbackStratumURL": "solo.ckpool.org",
+    "fallbackStratumPort": 3333,
+    "fallbackStratumUser": "bc1qexample.bitaxe",
+    "isUsingFallbackStratum": 0,
+    "bestDiff": "39.2G",
+    "bestSessionDiff": "27.4M",
+    "uptimeSeconds": 3600,
+    "wifiRSSI": -55,
+    "freeHeap": 150000,
+    "smallCoreCount": 894,
+    "asicCount": 1,
+}
+
+ASIC_INFO = {
+    "ASICModel": "BM1366",
+    "deviceModel": "Ultra",
+    "asicCount": 1,
+    "defaultFrequency": 485,
+    "defaultVoltage": 1200,
+}
+
+
+class FakeBitaxe:
+    """A local fake of the AxeOS HTTP API, standing in for BitaxeApiClient."""
+
+    def __init__(
+        self, host: str, port: int = 80, mac: str | None = None, timeout: float = 10
+    ) -> None:
+        """Initialize the fake device."""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.base_url = f"http://{host}:{port}"
+        self.timings: dict[str, tuple[float, float, float]] = {}
+        self.info = copy.deepcopy(SYSTEM_INFO)
+        if mac is not None:
+            self.info["macAddr"] = mac
+        self.asic = copy.deepcopy(ASIC_INFO)
+        self.error: BaseException | None = None
+        self.settings: list[dict[str, Any]] = []
+        self.restarts = 0
+        self.identifies = 0
+
+    def _check(self) -> None:
+        """Raise the configured error, if any."""
+        if self.error is not None:
+            raise self.error
+
+    async def get_system_info(self, priority: int = PRIORITY_POLL) -> dict[str, Any]:
+        """Return system info."""
+        self._check()
+        return copy.deepcopy(self.info)
+
+    async def get_asic_info(self, priority: int = PRIORITY_POLL) -> dict[str, Any]:
+        """Return ASIC info."""
+        self._check()
+        return copy.deepcopy(self.asic)
+
+    async def update_settings(
+        self, settings: dict[str, Any], priority: int = PRIORITY_USER
+    ) -> None:
+        """Apply settings."""
+        self._check()
+        self.settings.append(settings)
+        self.info.update(settings)
+
+    async def restart(self, priority: int = PRIORITY_USER) -> None:
+        """Restart the device."""
+        self._check()
+        self.restarts += 1
+        self.info["uptimeSeconds"] = 0
+
+    async def identify(self, priority: int = PRIORITY_USER) -> None:
+        """Identify the device."""
+        self._check()
+        self.identifies += 1
+
+    async def upload_ota(self, endpoint, path, progress_callback=None) -> None:
+        """Accept a firmware upload."""
+        self._check()
+
+
+class ReplayApiClient:
+    """Stand in for BitaxeApiClient, answering from a capture.
+
+    Every system info request, which the coordinator makes once per poll,
+    moves on to the next captured poll. Other endpoints answer with the
+    response captured in the current poll, or in the latest poll that had
+    one, so the replay does not depend on the coordinator fetching them on
+    exactly the same polls as during the capture. Captured errors are
+    raised again. Writes are recorded, not sent.
+    """
+
+    def __init__(self, host: str, port: int, polls: list[dict[str, Any]]) -> None:
+        """Initialize the client."""
+        self.host = host
+        self.port = port
+        self.base_url = f"http://{host}:{port}"
+        self.timings: dict[str, tuple[float, float, float]] = {}
+        self.writes: list[tuple[str, Any]] = []
+        self._polls: Iterator[dict[str, Any]] = iter(polls)
+        self._poll: dict[str, Any] | None = None
+        self._latest: dict[str, Any] = {}
+        self.remaining = len(polls)
+
+    def _respond(self, path: str) -> Any:
+        """Return the captured response of an endpoint."""
+        if self._poll is None:
+            raise aiohttp.ClientConnectionError("Capture has ended")
+        if (error := self._poll["errors"].get(path)) is not None:
+            name, message = error
+            if name == "TimeoutError":
+                raise asyncio.TimeoutError(message)
+            raise aiohttp.ClientError(f"{name}: {message}")
+        if path in self._poll["responses"]:
+            self._latest[path] = self._poll["responses"][path]
+        if path not in self._latest:
+            raise aiohttp.ClientError(f"{path} was not captured")
+        # Consumers may modify what they are given
+        return copy.deepcopy(self._latest[path])
+
+    async def get_system_info(self, priority: int = PRIORITY_POLL) -> dict[str, Any]:
+        """Move to the next captured poll and return its system info."""
+        self._poll = next(self._polls, None)
+        if self._poll is not None:
+            self.remaining -= 1
+        return self._respond(API_SYSTEM_INFO)
+
+    async def get_asic_info(self, priority: int = PRIORITY_POLL) -> dict[str, Any]:
+        """Return the captured ASIC info."""
+        return self._respond(API_SYSTEM_ASIC)
+
+    async def update_settings(
+        self, settings: dict[str, Any], priority: int = PRIORITY_USER
+    ) -> None:
+        """Record a settings update."""
+        self.writes.append(("update_settings", settings))
+
+    async def restart(self, priority: int = PRIORITY_USER) -> None:
+        """Record a restart."""
+        self.writes.append(("restart", None))
+
+    async def identify(self, priority: int = PRIORITY_USER) -> None:
+        """Record an identify."""
+        self.writes.append(("identify", None))
+
+    async def upload_ota(self, endpoint, path, progress_callback=None) -> None:
+        """Record a firmware upload."""
+        self.writes.append(("upload_ota", endpoint))
+
+
+class FakeFleet:
+    """Registry of fake devices, keyed by host."""
+
+    def __init__(self) -> None:
+        """Initialize the fleet."""
+        self.devices: dict[str, FakeBitaxe] = {}
+
+    def add(self, host: str, mac: str | None = None) -> FakeBitaxe:
+        """Add a fake device."""
+        self.devices[host] = FakeBitaxe(host, mac=mac)
+        return self.devices[host]
+
+    def client(self, host: str, port: int = 80, timeout: float = 10) -> FakeBitaxe:
+        """Return the device for a host, or an unreachable one."""
+        device = self.devices.get(host)
+        if device is None:
+            device = FakeBitaxe(host, port, timeout=timeout)
+            device.error = aiohttp.ClientConnectionError("unreachable")
+        return device
+
+    def move(self, host: str, new_host: str) -> FakeBitaxe:
+        """Move a device to a new address, as after a new DHCP lease."""
+        old = self.devices.pop(host)
+        old.error = aiohttp.ClientConnectionError("unreachable")
+        device = self.add(new_host, old.info["macAddr"])
+        device.info["ipv4"] = new_host
+        return device
+
+
+def get_entity_id(hass: HomeAssistant, platform: str, key: str) -> str:
+    """Return the entity id of a device entity by its key."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        platform, DOMAIN, f"{SYSTEM_INFO['macAddr']}_{key}"
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading the custom integration in every test."""
+
+
+@pytest.fixture(autouse=True)
+def history_dir(tmp_path) -> Generator[None, None, None]:
+    """Keep the history ring files of each test in its own directory."""
+    with patch(
+        "custom_components.bitaxe.coordinator.history_path",
+        side_effect=lambda hass, mac: str(tmp_path / f"history.{mac}"),
+    ):
+        yield
+
+
+@pytest.fixture
+def fake_fleet() -> Generator[FakeFleet, None, None]:
+    """Patch the API client so every host resolves to a fake device."""
+    fleet = FakeFleet()
+    with patch(
+        "custom_components.bitaxe.BitaxeApiClient", side_effect=fleet.client
+    ), patch(
+        "custom_components.bitaxe.config_flow.BitaxeApiClient",
+        side_effect=fleet.client,
+    ), patch(
+        "custom_components.bitaxe.resolver.BitaxeApiClient",
+        side_effect=fleet.client,
+    ):
+        yield fleet
+
+
+@pytest.fixture
+def fake_device(fake_fleet: FakeFleet) -> FakeBitaxe:
+    """Return a single fake device."""
+    return fake_fleet.add("192.168.1.50")
+
+
+def make_entry(host: str, mac: str, options: dict[str, Any] | None = None) -> MockConfigEntry:
+    """Create a config entry for a device."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Bitaxe {host}",
+        unique_id=mac,
+        data={CONF_HOST: host, CONF_NAME: f"Bitaxe {host}", CONF_PORT: 80},
+        options={CONF_SCAN_INTERVAL: 15, **(options or {})},
+    )
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, fake_device: FakeBitaxe
+) -> MockConfigEntry:
+    """Set up the integration with a single fake device."""
+    entry = make_entry(fake_device.host, fake_device.info["macAddr"])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
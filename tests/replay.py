@@ -0,0 +1,79 @@
+"""Replay driver for Bitaxe capture files.
+
+Plays captured polls through the coordinator and every platform, as fast as
+the event loop allows, by advancing the frozen clock one scan interval per
+step. Used by the replay tests; point ``BITAXE_REPLAY`` at capture files
+written by the ``bitaxe.capture`` service to reproduce and time a production
+sequence offline.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+from unittest.mock import AsyncMock, patch
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.bitaxe.capture import read_capture
+from custom_components.bitaxe.const import API_SYSTEM_INFO, DOMAIN
+
+from .conftest import ReplayApiClient, make_entry
+
+SCAN_INTERVAL = 15
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a replay."""
+
+    clients: dict[str, ReplayApiClient]
+    polls: int
+    simulated_seconds: float
+    cpu_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        """Return how much faster than real time the replay ran."""
+        return self.simulated_seconds / self.cpu_seconds if self.cpu_seconds else 0.0
+
+
+async def async_replay(
+    hass: HomeAssistant, freezer, paths: list[str]
+) -> ReplayResult:
+    """Set up a device per capture file and replay every captured poll."""
+    clients: dict[str, ReplayApiClient] = {}
+    for index, path in enumerate(paths):
+        polls = read_capture(path)
+        mac = next(
+            poll["responses"][API_SYSTEM_INFO]["macAddr"]
+            for poll in polls
+            if API_SYSTEM_INFO in poll["responses"]
+        )
+        host = f"10.1.{index // 250}.{index % 250 + 1}"
+        clients[host] = ReplayApiClient(host, 80, polls)
+        make_entry(host, mac).add_to_hass(hass)
+
+    polls = sum(client.remaining for client in clients.values())
+    steps = 0
+    with patch(
+        "custom_components.bitaxe.BitaxeApiClient",
+        side_effect=lambda host, port, *args, **kwargs: clients[host],
+    ), patch(
+        # Captured outages must not send the resolver probing the local network
+        "custom_components.bitaxe.resolver.async_resolve_host",
+        AsyncMock(return_value=None),
+    ):
+        start = time.process_time()
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+        while any(client.remaining for client in clients.values()) and steps < polls:
+            freezer.tick(SCAN_INTERVAL)
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+            steps += 1
+        cpu_seconds = time.process_time() - start
+
+    return ReplayResult(clients, polls, (steps + 1) * SCAN_INTERVAL, cpu_seconds)
@@ -0,0 +1,80 @@
+"""Tests for the Bitaxe fleet anomaly detection."""
+from __future__ import annotations
+
+import numpy as np
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.bitaxe.analytics import score_fleet
+from custom_components.bitaxe.const import DOMAIN
+
+from .conftest import FakeFleet, make_entry
+
+
+def test_score_fleet() -> None:
+    """Test devices are only scored against peers of the same model."""
+    values = np.array(
+        [
+            # hashrate per MHz, J/TH, temperature, reject rate
+            [1.0, 20.0, 55.0, 0.5],
+            [1.0, 20.5, 56.0, 0.4],
+            [1.1, 19.5, 54.0, 0.6],
+            [0.6, 20.0, 70.0, np.nan],
+            [2.0, 15.0, 60.0, 0.1],
+        ]
+    )
+    z_scores, scores, peers = score_fleet(
+        ["BM1366", "BM1366", "BM1366", "BM1366", "BM1370"], values
+    )
+
+    assert list(peers) == [4, 4, 4, 4, 1]
+    # Slow and hot
+    assert scores[3] > 3.5
+    assert z_scores[3, 0] > 3.5
+    assert z_scores[3, 2] > 3.5
+    assert np.isnan(z_scores[3, 3])
+    assert all(scores[:3] < 3.5)
+    # A faster device is not anomalous
+    assert z_scores[2, 0] < 0
+    # Nothing to compare against
+    assert np.isnan(scores[4])
+
+
+async def test_anomaly_sensor(
+    hass: HomeAssistant, fake_fleet: FakeFleet, freezer
+) -> None:
+    """Test the anomaly sensor flags a device running hotter than its peers."""
+    macs = [f"AA:BB:CC:00:00:{index:02X}" for index in range(4)]
+    for index, mac in enumerate(macs):
+        host = f"192.168.1.{index + 10}"
+        device = fake_fleet.add(host, mac)
+        device.info["temp"] = 55 + index * 0.5
+        make_entry(host, mac).add_to_hass(hass)
+    fake_fleet.devices["192.168.1.13"].info["temp"] = 75
+
+    assert await hass.config_entries.async_setup(
+        hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    )
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    entity_ids = [
+        registry.async_get_entity_id("sensor", DOMAIN, f"{mac}_anomalyScore")
+        for mac in macs
+    ]
+    assert hass.states.get(entity_ids[0]).state == "unknown"
+
+    freezer.tick(15)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_ids[3])
+    assert float(state.state) > 3.5
+    assert state.attributes["outlier"] is True
+    assert state.attributes["peers"] == 4
+    assert state.attributes["temp"] > 3.5
+    state = hass.states.get(entity_ids[0])
+    assert float(state.state) < 3.5
+    assert state.attributes["outlier"] is False
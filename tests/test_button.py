@@ -0,0 +1,22 @@
+"""Tests for the Bitaxe button platform."""
+from __future__ import annotations
+
+from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN, SERVICE_PRESS
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeBitaxe, get_entity_id
+
+
+async def test_buttons(hass: HomeAssistant, init_integration, fake_device: FakeBitaxe) -> None:
+    """Test the restart and identify buttons call the device."""
+    for key in ("restart", "identify"):
+        await hass.services.async_call(
+            BUTTON_DOMAIN,
+            SERVICE_PRESS,
+            {ATTR_ENTITY_ID: get_entity_id(hass, "button", key)},
+            blocking=True,
+        )
+
+    assert fake_device.restarts == 1
+    assert fake_device.identifies == 1
@@ -0,0 +1,104 @@
+"""Tests for capturing and replaying Bitaxe device payloads."""
+from __future__ import annotations
+
+import copy
+import glob
+import os
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from custom_components.bitaxe.capture import CaptureWriter, read_capture
+from custom_components.bitaxe.const import (
+    API_SYSTEM_ASIC,
+    API_SYSTEM_INFO,
+    DOMAIN,
+)
+
+from .conftest import ASIC_INFO, SYSTEM_INFO, FakeBitaxe, get_entity_id
+from .replay import async_replay
+
+
+async def test_capture_service(
+    hass: HomeAssistant, init_integration, fake_device: FakeBitaxe
+) -> None:
+    """Test the capture service records every poll of the device."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    async def _poll(duration: float) -> None:
+        await coordinator.async_refresh()
+        fake_device.error = TimeoutError("timed out")
+        await coordinator.async_refresh()
+
+    with patch("custom_components.bitaxe.services.asyncio.sleep", _poll):
+        response = await hass.services.async_call(
+            DOMAIN, "capture", {}, blocking=True, return_response=True
+        )
+
+    [path] = response["paths"]
+    assert os.path.basename(path).startswith("bitaxe_capture_aabbccddee01_")
+    assert path.endswith(".jsonl.gz")
+    assert coordinator.capture is None
+
+    polls = read_capture(path)
+    assert len(polls) == 2
+    assert polls[0]["responses"][API_SYSTEM_INFO]["hashRate"] == 500.0
+    assert polls[0]["errors"] == {}
+    assert polls[1]["responses"] == {}
+    assert polls[1]["errors"][API_SYSTEM_INFO] == ["TimeoutError", "timed out"]
+    os.remove(path)
+
+
+async def test_replay(hass: HomeAssistant, freezer, tmp_path) -> None:
+    """Test a capture replays through the coordinator and the platforms."""
+    path = str(tmp_path / "capture.jsonl.gz")
+    writer = CaptureWriter(path)
+    for index in range(6):
+        info = copy.deepcopy(SYSTEM_INFO)
+        info["hashRate"] = 500.0 + index
+        info["bestDiff"] = f"{index + 1}.5G"
+        if index == 3:
+            # Keys go missing while the firmware reboots
+            del info["temp"]
+        responses = {API_SYSTEM_INFO: info}
+        if index == 0:
+            responses[API_SYSTEM_ASIC] = ASIC_INFO
+        writer.write(CaptureWriter.encode(index * 15.0, responses, {}))
+    for _ in range(4):
+        writer.write(
+            CaptureWriter.encode(
+                0, {}, {API_SYSTEM_INFO: TimeoutError("timed out")}
+            )
+        )
+    writer.close()
+
+    result = await async_replay(hass, freezer, [path])
+
+    assert result.polls == 10
+    assert all(not client.remaining for client in result.clients.values())
+    # Four timeouts in a row make the device unavailable
+    assert hass.states.get(get_entity_id(hass, "sensor", "hashRate")).state == (
+        STATE_UNAVAILABLE
+    )
+    [client] = result.clients.values()
+    assert client.writes == []
+
+
+@pytest.mark.skipif(
+    not os.environ.get("BITAXE_REPLAY"), reason="BITAXE_REPLAY is not set"
+)
+async def test_replay_captures(hass: HomeAssistant, freezer) -> None:
+    """Replay and time the capture files matching BITAXE_REPLAY."""
+    paths = sorted(glob.glob(os.environ["BITAXE_REPLAY"]))
+    assert paths, "BITAXE_REPLAY matches no files"
+
+    result = await async_replay(hass, freezer, paths)
+
+    print(
+        f"\nReplayed {result.polls} polls from {len(paths)} captures: "
+        f"{result.simulated_seconds:.0f} s of polling in {result.cpu_seconds:.1f} s "
+        f"of CPU ({result.speedup:.0f}x real time)"
+    )
@@ -0,0 +1,117 @@
+"""Tests for the Bitaxe config flow."""
+from __future__ import annotations
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.bitaxe.const import CONF_MONITORING_ONLY, DOMAIN
+
+from .conftest import FakeBitaxe, FakeFleet
+
+
+async def test_user_flow(hass: HomeAssistant, fake_device: FakeBitaxe) -> None:
+    """Test the full user flow creates an entry."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: fake_device.host}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "config"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_NAME: "Office", CONF_PORT: 80, CONF_SCAN_INTERVAL: 30},
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Office"
+    assert result["data"] == {CONF_HOST: fake_device.host, CONF_NAME: "Office", CONF_PORT: 80}
+    assert result["options"] == {CONF_SCAN_INTERVAL: 30}
+    assert result["result"].unique_id == fake_device.info["macAddr"]
+
+
+async def test_user_flow_cannot_connect(
+    hass: HomeAssistant, fake_fleet: FakeFleet
+) -> None:
+    """Test an unreachable host shows an error."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "192.168.1.99"}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+async def test_user_flow_already_configured(
+    hass: HomeAssistant, init_integration, fake_device: FakeBitaxe
+) -> None:
+    """Test a device that is already configured is rejected."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: fake_device.host}
+    )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_options_flow(hass: HomeAssistant, init_integration) -> None:
+    """Test the options flow updates the entry options."""
+    result = await hass.config_entries.options.async_init(init_integration.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SCAN_INTERVAL: 60}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert init_integration.options[CONF_SCAN_INTERVAL] == 60
+
+
+async def test_options_flow_monitoring_only(
+    hass: HomeAssistant, init_integration
+) -> None:
+    """Test switching to monitoring only drops the control entities and back."""
+    registry = er.async_get(hass)
+
+    def _domains() -> set[str]:
+        return {
+            entity.domain
+            for entity in er.async_entries_for_config_entry(
+                registry, init_integration.entry_id
+            )
+        }
+
+    assert _domains() == {"sensor", "switch", "select", "button", "number", "update"}
+    sensors = len(hass.states.async_entity_ids("sensor"))
+
+    for monitoring_only in (True, False):
+        result = await hass.config_entries.options.async_init(init_integration.entry_id)
+        await hass.config_entries.options.async_configure(
+            result["flow_id"], {CONF_MONITORING_ONLY: monitoring_only}
+        )
+        await hass.async_block_till_done()
+
+        assert init_integration.state is config_entries.ConfigEntryState.LOADED
+        if monitoring_only:
+            assert _domains() == {"sensor"}
+            assert hass.states.async_entity_ids("switch") == []
+        else:
+            assert len(_domains()) == 6
+        assert len(hass.states.async_entity_ids("sensor")) == sensors
@@ -0,0 +1,226 @@
+"""Tests for the Bitaxe coordinator."""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.bitaxe.const import DEFAULT_DATA, DOMAIN
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+
+from .conftest import FakeBitaxe
+
+
+def _coordinator(hass: HomeAssistant, device: FakeBitaxe, **kwargs) -> BitaxeDataUpdateCoordinator:
+    """Create a coordinator polling a fake device."""
+    return BitaxeDataUpdateCoordinator(hass, device, "Test", 15, **kwargs)
+
+
+async def test_update_merges_endpoints(hass: HomeAssistant) -> None:
+    """Test a poll merges system info with the optional endpoints."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = _coordinator(hass, device)
+
+    data = await coordinator._async_update_data()
+
+    assert data["hashRate"] == 500.0
+    assert data["ip"] == "192.168.1.50"
+    assert data["asic"]["deviceModel"] == "Ultra"
+    assert data["efficiency"] == pytest.approx(12.5 * 1000 / 495.0, abs=0.01)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [asyncio.TimeoutError(), aiohttp.ClientError("boom"), ValueError("bad json")],
+)
+async def test_update_failures(hass: HomeAssistant, error: Exception) -> None:
+    """Test failures return placeholder data, then raise after three attempts."""
+    device = FakeBitaxe("192.168.1.50")
+    device.error = error
+    coordinator = _coordinator(hass, device)
+
+    for _ in range(3):
+        assert await coordinator._async_update_data() is DEFAULT_DATA
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    device.error = None
+    data = await coordinator._async_update_data()
+    assert data["hashRate"] == 500.0
+    assert coordinator._failure_count == 0
+
+
+async def test_optional_endpoint_failure_keeps_data(hass: HomeAssistant) -> None:
+    """Test a failing optional endpoint does not fail the poll."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = _coordinator(hass, device)
+    await coordinator._async_update_data()
+
+    async def _fail():
+        raise aiohttp.ClientError("not found")
+
+    device.get_asic_info = _fail
+    device.info["version"] = "v2.5.0"  # new firmware makes the ASIC endpoint due
+    coordinator.data = await coordinator._async_update_data()
+
+    data = await coordinator._async_update_data()
+    assert data["asic"]["deviceModel"] == "Ultra"
+    assert data["version"] == "v2.5.0"
+
+
+async def test_share_rates_survive_reboot(hass: HomeAssistant, freezer) -> None:
+    """Test a counter reset after a reboot does not produce a negative rate."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = _coordinator(hass, device)
+
+    await coordinator._async_update_data()
+    freezer.tick(60)
+    device.info.update(sharesAccepted=0, sharesRejected=0, uptimeSeconds=10)
+    data = await coordinator._async_update_data()
+
+    assert data["sharesPerMinute_5m"] == 0
+    assert data["rejectRate_5m"] is None
+
+
+async def test_share_rates_at_long_scan_interval(hass: HomeAssistant, freezer) -> None:
+    """Test the windowed rates span polls further apart than the window."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = BitaxeDataUpdateCoordinator(hass, device, "Test", 300)
+
+    await coordinator._async_update_data()
+    freezer.tick(301)
+    device.info.update(sharesAccepted=1030, sharesRejected=8)
+    data = await coordinator._async_update_data()
+
+    assert data["sharesPerMinute_5m"] == pytest.approx(30 * 60 / 301, abs=0.01)
+    assert data["rejectRate_5m"] == pytest.approx(3 * 100 / 33, abs=0.01)
+
+    freezer.tick(301)
+    data = await coordinator._async_update_data()
+    assert data["sharesPerMinute_5m"] == 0
+    assert data["sharesPerMinute_1h"] == pytest.approx(30 * 60 / 602, abs=0.01)
+
+
+async def test_energy_at_long_scan_interval(hass: HomeAssistant, freezer) -> None:
+    """Test energy is integrated across long scan intervals and a failed poll."""
+    device = FakeBitaxe("192.168.1.50")
+    device.info["power"] = 100.0
+    coordinator = BitaxeDataUpdateCoordinator(hass, device, "Test", 300)
+
+    await coordinator._async_update_data()
+    freezer.tick(301)
+    data = await coordinator._async_update_data()
+    assert data["energy"] == pytest.approx(100 * 301 / 3_600_000, abs=1e-4)
+
+    # The total stays known while a poll fails, and the gap is bridged
+    device.error = asyncio.TimeoutError()
+    freezer.tick(300)
+    data = await coordinator._async_update_data()
+    assert data["energy"] == pytest.approx(100 * 301 / 3_600_000, abs=1e-4)
+
+    device.error = None
+    freezer.tick(300)
+    data = await coordinator._async_update_data()
+    assert data["energy"] == pytest.approx(100 * 901 / 3_600_000, abs=1e-4)
+
+
+async def test_threshold_events_fire_on_transitions(hass: HomeAssistant) -> None:
+    """Test threshold alerts fire once when raised and once when cleared."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = _coordinator(hass, device, options={"overheat_temp": 70})
+    events = async_capture_events(hass, f"{DOMAIN}_overheat")
+
+    for temp in (65, 71, 72, 68, 66):
+        device.info["temp"] = temp
+        await coordinator._async_update_data()
+    await hass.async_block_till_done()
+
+    assert [(event.data["active"], event.data["value"]) for event in events] == [
+        (True, 71),
+        (False, 66),
+    ]
+
+
+async def test_pool_failover_and_switch_back(hass: HomeAssistant, freezer) -> None:
+    """Test a device fails over after a bad window and later tries the primary again."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = _coordinator(
+        hass, device, options={"pool_failover": True, "failover_window": 600}
+    )
+    events = async_capture_events(hass, f"{DOMAIN}_pool_switch")
+
+    async def _poll(seconds: int) -> None:
+        freezer.tick(seconds)
+        await coordinator._async_update_data()
+        await hass.async_block_till_done()
+
+    device.info["errorPercentage"] = 25
+    await _poll(0)
+    await _poll(300)
+    assert device.settings == []
+
+    await _poll(300)
+    assert device.settings == [{"useFallbackStratum": 1}]
+    assert device.restarts == 1
+    assert events[-1].data["pool"] == "fallback"
+
+    # Healthy on the fallback until it is time to retry the primary
+    device.info.update(errorPercentage=0.5, isUsingFallbackStratum=1)
+    await _poll(1800)
+    assert len(device.settings) == 1
+    await _poll(1800)
+    assert device.settings[-1] == {"useFallbackStratum": 0}
+    assert events[-1].data["pool"] == "primary"
+
+
+async def test_pool_failover_disabled_by_default(hass: HomeAssistant, freezer) -> None:
+    """Test nothing is switched unless failover is enabled."""
+    device = FakeBitaxe("192.168.1.50")
+    coordinator = _coordinator(hass, device)
+    device.info["errorPercentage"] = 25
+
+    for _ in range(5):
+        freezer.tick(600)
+        data = await coordinator._async_update_data()
+
+    assert data["pool"] == "primary"
+    assert device.settings == []
+
+
+async def test_pool_switch_back_after_reload(
+    hass: HomeAssistant, hass_storage, freezer
+) -> None:
+    """Test a device failed over before a reload is still switched back."""
+    device = FakeBitaxe("192.168.1.50")
+    options = {"pool_failover": True, "failover_window": 600}
+    coordinator = _coordinator(hass, device, options=options)
+
+    device.info["errorPercentage"] = 25
+    for _ in range(3):
+        await coordinator._async_update_data()
+        freezer.tick(300)
+    await hass.async_block_till_done()
+    assert device.settings == [{"useFallbackStratum": 1}]
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage["bitaxe.pool.aabbccddee01"]["data"]["failed_over"] is True
+
+    # A new coordinator, as after a reload or restart
+    device.info.update(errorPercentage=0.5, isUsingFallbackStratum=1)
+    coordinator = _coordinator(hass, device, options=options)
+    await coordinator._async_update_data()
+    freezer.tick(3600)
+    await coordinator._async_update_data()
+    await hass.async_block_till_done()
+
+    assert device.settings[-1] == {"useFallbackStratum": 0}
@@ -0,0 +1,166 @@
+"""Tests for the Bitaxe fleet helpers."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+from custom_components.bitaxe.fleet import (
+    async_firmware_rollout,
+    async_rolling_restart,
+)
+
+from .conftest import FakeBitaxe
+
+
+@pytest.fixture(autouse=True)
+def fast_recovery_polls():
+    """Poll restarted devices without waiting."""
+    with patch("custom_components.bitaxe.fleet.RECOVERY_POLL_INTERVAL", 0):
+        yield
+
+
+@pytest.fixture
+async def fleet(hass: HomeAssistant):
+    """Return a factory of coordinators for fake devices that have polled once."""
+    coordinators: list[BitaxeDataUpdateCoordinator] = []
+
+    async def _fleet(count: int) -> list[BitaxeDataUpdateCoordinator]:
+        for index in range(count):
+            device = FakeBitaxe(
+                f"192.168.1.{index + 1}", mac=f"AA:BB:CC:DD:EE:{index + 1:02X}"
+            )
+            coordinator = BitaxeDataUpdateCoordinator(
+                hass, device, f"Bitaxe {index + 1}", 15
+            )
+            await coordinator.async_refresh()
+            coordinators.append(coordinator)
+        return coordinators
+
+    yield _fleet
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+def _never_recovers(device: FakeBitaxe) -> None:
+    """Make a device reboot without ever hashing again."""
+
+    async def _restart(priority: int = 0) -> None:
+        device.restarts += 1
+        device.info.update(uptimeSeconds=0, hashRate=0)
+
+    device.restart = _restart
+
+
+async def test_rolling_restart_in_batches(hass: HomeAssistant, fleet) -> None:
+    """Test each batch is restarted only after the previous one recovered."""
+    coordinators = await fleet(5)
+    devices = [coordinator.api for coordinator in coordinators]
+    started: list[list[int]] = []
+
+    for device in devices:
+        restart = device.restart
+
+        async def _restart(priority: int = 0, restart=restart) -> None:
+            started.append([other.restarts for other in devices])
+            await restart(priority)
+
+        device.restart = _restart
+
+    await async_rolling_restart(coordinators, 2, 1, 0)
+
+    assert [device.restarts for device in devices] == [1, 1, 1, 1, 1]
+    # The third device starts once the first batch restarted, and not before
+    assert started[2] == [1, 1, 0, 0, 0]
+    assert started[4] == [1, 1, 1, 1, 0]
+
+
+async def test_rolling_restart_aborts_after_failures(hass: HomeAssistant, fleet) -> None:
+    """Test the restart stops once too many devices fail to recover."""
+    coordinators = await fleet(4)
+    devices = [coordinator.api for coordinator in coordinators]
+    _never_recovers(devices[1])
+
+    with pytest.raises(HomeAssistantError, match="Bitaxe 2"):
+        await async_rolling_restart(coordinators, 2, 0.05, 1)
+
+    assert [device.restarts for device in devices] == [1, 1, 0, 0]
+
+
+async def test_rolling_restart_continues_without_failure_limit(
+    hass: HomeAssistant, fleet
+) -> None:
+    """Test unrecovered devices do not stop the restart without a failure limit."""
+    coordinators = await fleet(3)
+    devices = [coordinator.api for coordinator in coordinators]
+    _never_recovers(devices[0])
+
+    await async_rolling_restart(coordinators, 1, 0.05, 0)
+
+    assert [device.restarts for device in devices] == [1, 1, 1]
+
+
+class _FirmwareManager:
+    """Stand in for BitaxeFirmwareManager, recording the installs."""
+
+    def __init__(self, failing: set[str] | None = None) -> None:
+        """Initialize the manager."""
+        self.image = SimpleNamespace(version="v2.5.0")
+        self.failing = failing or set()
+        # Name of each device and how many installs had finished before it
+        self.started: list[tuple[str, int]] = []
+        self.finished = 0
+
+    async def async_install(self, coordinator: BitaxeDataUpdateCoordinator) -> bool:
+        """Pretend to install the firmware on a device."""
+        self.started.append((coordinator.name, self.finished))
+        await asyncio.sleep(0)
+        self.finished += 1
+        return coordinator.name not in self.failing
+
+
+async def test_firmware_rollout_canary_then_batches(hass: HomeAssistant, fleet) -> None:
+    """Test the canary goes first and devices on the new version are skipped."""
+    coordinators = await fleet(5)
+    coordinators[1].data["version"] = "v2.5.0"
+    manager = _FirmwareManager()
+
+    await async_firmware_rollout(manager, coordinators, 1, 2, 1)
+
+    assert manager.started == [
+        ("bitaxe_Bitaxe 1", 0),
+        ("bitaxe_Bitaxe 3", 1),
+        ("bitaxe_Bitaxe 4", 1),
+        ("bitaxe_Bitaxe 5", 3),
+    ]
+
+
+async def test_firmware_rollout_aborts_on_failed_canary(
+    hass: HomeAssistant, fleet
+) -> None:
+    """Test a canary that does not recover stops the rollout."""
+    coordinators = await fleet(4)
+    manager = _FirmwareManager(failing={"bitaxe_Bitaxe 1"})
+
+    with pytest.raises(HomeAssistantError, match="Bitaxe 1"):
+        await async_firmware_rollout(manager, coordinators, 1, 2, 1)
+
+    assert manager.started == [("bitaxe_Bitaxe 1", 0)]
+
+
+async def test_firmware_rollout_nothing_to_do(hass: HomeAssistant, fleet) -> None:
+    """Test nothing is installed when every device runs the new version."""
+    coordinators = await fleet(2)
+    for coordinator in coordinators:
+        coordinator.data["version"] = "v2.5.0"
+    manager = _FirmwareManager()
+
+    await async_firmware_rollout(manager, coordinators, 1, 2, 1)
+
+    assert manager.started == []
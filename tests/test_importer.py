@@ -0,0 +1,98 @@
+"""Tests for the Bitaxe bulk import."""
+from __future__ import annotations
+
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+
+from custom_components.bitaxe.const import DOMAIN
+from custom_components.bitaxe.importer import parse_host
+
+from .conftest import FakeBitaxe, FakeFleet
+
+
+async def test_import_hosts(
+    hass: HomeAssistant, fake_fleet: FakeFleet, init_integration, fake_device: FakeBitaxe
+) -> None:
+    """Test hosts are validated, deduplicated by MAC and imported in one call."""
+    fake_fleet.add("192.168.1.51", mac="AA:BB:CC:00:00:51")
+    fake_fleet.add("192.168.1.52", mac="AA:BB:CC:00:00:52")
+    fake_fleet.add("192.168.1.53", mac="AA:BB:CC:00:00:52")
+    fake_fleet.devices["192.168.1.51"].info["hostname"] = "garage"
+    fake_fleet.devices["192.168.1.52"].info["hostname"] = "garage"
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_hosts",
+        {
+            "hosts": [
+                "192.168.1.51",
+                "192.168.1.52:80",
+                "192.168.1.53",
+                fake_device.host,
+                "192.168.1.99",
+            ],
+            CONF_SCAN_INTERVAL: 30,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert response["created"] == [
+        {"host": "192.168.1.51", "mac": "AA:BB:CC:00:00:51", "name": "garage 000051"},
+        {"host": "192.168.1.52", "mac": "AA:BB:CC:00:00:52", "name": "garage 000052"},
+    ]
+    assert response["skipped"] == [
+        {"host": "192.168.1.53", "mac": "AA:BB:CC:00:00:52", "reason": "duplicate"},
+        {
+            "host": fake_device.host,
+            "mac": fake_device.info["macAddr"],
+            "reason": "already_configured",
+        },
+    ]
+    assert [item["host"] for item in response["failed"]] == ["192.168.1.99"]
+
+    entries = {
+        entry.unique_id: entry for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    assert len(entries) == 3
+    entry = entries["AA:BB:CC:00:00:51"]
+    assert entry.data[CONF_HOST] == "192.168.1.51"
+    assert entry.data[CONF_PORT] == 80
+    assert entry.options[CONF_SCAN_INTERVAL] == 30
+    assert hass.data[DOMAIN][entry.entry_id].data["hashRate"] == 500.0
+
+
+async def test_import_hosts_from_text(
+    hass: HomeAssistant, fake_fleet: FakeFleet, init_integration
+) -> None:
+    """Test a comma separated list of hosts is split into its hosts and ports."""
+    fake_fleet.add("192.168.1.51", mac="AA:BB:CC:00:00:51")
+    fake_fleet.add("192.168.1.52", mac="AA:BB:CC:00:00:52")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_hosts",
+        {"hosts": "192.168.1.51, 192.168.1.52:8080"},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert [item["host"] for item in response["created"]] == [
+        "192.168.1.51",
+        "192.168.1.52",
+    ]
+    entries = {
+        entry.unique_id: entry for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    assert entries["AA:BB:CC:00:00:52"].data[CONF_PORT] == 8080
+
+
+def test_parse_host() -> None:
+    """Test ports are only split off IPv6 addresses in brackets."""
+    assert parse_host(" 192.168.1.50 ", 80) == ("192.168.1.50", 80)
+    assert parse_host("bitaxe.local:8080", 80) == ("bitaxe.local", 8080)
+    assert parse_host("fe80::1", 80) == ("fe80::1", 80)
+    assert parse_host("[fe80::1]", 80) == ("[fe80::1]", 80)
+    assert parse_host("[fe80::1]:8080", 80) == ("[fe80::1]", 8080)
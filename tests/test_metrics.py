@@ -0,0 +1,75 @@
+"""Tests for the Bitaxe Prometheus metrics view."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeBitaxe
+
+
+async def test_metrics(
+    hass: HomeAssistant,
+    hass_client,
+    init_integration: MockConfigEntry,
+    fake_device: FakeBitaxe,
+    freezer,
+) -> None:
+    """Test the metrics are rendered and only change after a poll."""
+    # Queue wait, request and decode time of the last poll
+    fake_device.timings["/api/system/info"] = (0.5, 0.25, 0.001)
+    client = await hass_client()
+
+    response = await client.get("/api/bitaxe/metrics")
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = await response.text()
+    labels = '{name="Bitaxe 192.168.1.50",mac="AA:BB:CC:DD:EE:01"}'
+    assert "# TYPE bitaxe_hashrate_ghs gauge" in body
+    assert f"bitaxe_up{labels} 1" in body
+    assert f"bitaxe_poll_latency_seconds{labels} 0.25" in body
+    assert f"bitaxe_hashrate_ghs{labels} 500.0" in body
+    assert f"bitaxe_shares_accepted_total{labels} 1000" in body
+    assert body.count("# TYPE bitaxe_temperature_celsius") == 1
+
+    fake_device.info["temp"] = 61.5
+    assert await (await client.get("/api/bitaxe/metrics")).text() == body
+
+    freezer.tick(15)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    body = await (await client.get("/api/bitaxe/metrics")).text()
+    assert f"bitaxe_temperature_celsius{labels} 61.5" in body
+
+
+async def test_metrics_device_down(
+    hass: HomeAssistant,
+    hass_client,
+    init_integration: MockConfigEntry,
+    fake_device: FakeBitaxe,
+    freezer,
+) -> None:
+    """Test an unreachable device only exports its poll health."""
+    fake_device.error = TimeoutError()
+    freezer.tick(15)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    client = await hass_client()
+    body = await (await client.get("/api/bitaxe/metrics")).text()
+    labels = '{name="Bitaxe 192.168.1.50",mac="AA:BB:CC:DD:EE:01"}'
+    assert f"bitaxe_up{labels} 0" in body
+    assert f"bitaxe_poll_failures{labels} 1" in body
+    assert "bitaxe_hashrate_ghs{" not in body
+
+
+async def test_metrics_require_auth(
+    hass: HomeAssistant, hass_client_no_auth, init_integration: MockConfigEntry
+) -> None:
+    """Test the metrics view requires authentication."""
+    client = await hass_client_no_auth()
+    response = await client.get("/api/bitaxe/metrics")
+    assert response.status == 401
@@ -0,0 +1,32 @@
+"""Tests for the Bitaxe number platform."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components.number import (
+    ATTR_VALUE,
+    DOMAIN as NUMBER_DOMAIN,
+    SERVICE_SET_VALUE,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeBitaxe, get_entity_id
+
+
+async def test_number(hass: HomeAssistant, init_integration, fake_device: FakeBitaxe) -> None:
+    """Test numbers reflect and change device settings."""
+    entity_id = get_entity_id(hass, "number", "frequency")
+    assert hass.states.get(entity_id).state == "500"
+
+    with patch("custom_components.bitaxe.number.asyncio.sleep"):
+        await hass.services.async_call(
+            NUMBER_DOMAIN,
+            SERVICE_SET_VALUE,
+            {ATTR_ENTITY_ID: entity_id, ATTR_VALUE: 525},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    assert fake_device.settings[-1] == {"frequency": 525}
+    assert hass.states.get(entity_id).state == "525"
@@ -0,0 +1,148 @@
+"""Tests for the Bitaxe power-budget controller."""
+from __future__ import annotations
+
+import pytest
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bitaxe.const import DOMAIN, FREQUENCY_SAVE_DELAY
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+from custom_components.bitaxe.power_budget import BitaxePowerBudgetController
+
+from .conftest import FakeBitaxe, make_entry
+
+BUDGET_ENTITY = "input_number.bitaxe_budget"
+
+
+@pytest.fixture
+async def devices(hass: HomeAssistant):
+    """Return two polled fake devices drawing 20 W, the second more efficient."""
+    devices: list[FakeBitaxe] = []
+    coordinators: list[BitaxeDataUpdateCoordinator] = []
+    for index, hashrate in enumerate((400.0, 600.0)):
+        device = FakeBitaxe(
+            f"192.168.1.{index + 1}", mac=f"AA:BB:CC:DD:EE:{index + 1:02X}"
+        )
+        device.info.update(power=20.0, hashRate_10m=hashrate)
+        coordinator = BitaxeDataUpdateCoordinator(
+            hass, device, f"Bitaxe {index + 1}", 15
+        )
+        await coordinator.async_refresh()
+        hass.data.setdefault(DOMAIN, {})[f"entry_{index}"] = coordinator
+        devices.append(device)
+        coordinators.append(coordinator)
+
+    yield devices
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def _evaluate(
+    hass: HomeAssistant, controller: BitaxePowerBudgetController, budget: float
+) -> None:
+    """Set the budget and let the controller act on it."""
+    hass.states.async_set(BUDGET_ENTITY, str(budget))
+    await controller._async_evaluate()
+    await hass.async_block_till_done()
+
+
+async def test_shed_least_efficient_first_and_restore(
+    hass: HomeAssistant, freezer, devices: list[FakeBitaxe]
+) -> None:
+    """Test the least efficient device is throttled, then restored to its baseline."""
+    controller = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+
+    await _evaluate(hass, controller, 38)
+    assert devices[0].settings == [{"frequency": 450}]
+    assert devices[1].settings == []
+
+    # Not touched again until the reduction had time to show up
+    devices[0].info["power"] = 18.0
+    await _evaluate(hass, controller, 100)
+    assert devices[0].settings == [{"frequency": 450}]
+
+    freezer.tick(30)
+    await _evaluate(hass, controller, 100)
+    assert devices[0].settings[-1] == {"frequency": 500}
+    assert devices[1].settings == []
+
+
+async def test_stale_reading_is_not_taken_for_a_manual_change(
+    hass: HomeAssistant, freezer, devices: list[FakeBitaxe]
+) -> None:
+    """Test a poll from before a write does not reset the baseline."""
+    controller = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+    coordinator = hass.data[DOMAIN]["entry_0"]
+
+    await _evaluate(hass, controller, 38)
+    assert devices[0].settings == [{"frequency": 450}]
+
+    # A poll that was in flight during the write still shows the old frequency
+    coordinator.data = {**coordinator.data, "frequency": 500, "power": 18.0}
+    await _evaluate(hass, controller, 38)
+    devices[0].info["power"] = 18.0
+    await coordinator.async_refresh()
+    await _evaluate(hass, controller, 38)
+
+    freezer.tick(30)
+    await _evaluate(hass, controller, 100)
+    assert devices[0].settings[-1] == {"frequency": 500}
+
+
+async def test_unreachable_device_counts_at_last_power(
+    hass: HomeAssistant, freezer, devices: list[FakeBitaxe]
+) -> None:
+    """Test an outage does not free up budget for the other devices."""
+    controller = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+
+    await _evaluate(hass, controller, 38)
+    assert devices[0].settings == [{"frequency": 450}]
+    devices[0].info["power"] = 18.0
+    await hass.data[DOMAIN]["entry_0"].async_refresh()
+
+    devices[1].error = TimeoutError("timed out")
+    await hass.data[DOMAIN]["entry_1"].async_refresh()
+    freezer.tick(30)
+    await _evaluate(hass, controller, 38)
+
+    assert devices[0].settings == [{"frequency": 450}]
+
+
+async def test_baseline_survives_restart(
+    hass: HomeAssistant, hass_storage, fake_device: FakeBitaxe
+) -> None:
+    """Test a device throttled before a restart is restored to the user's frequency."""
+    hass_storage["bitaxe.frequency.aabbccddee01"] = {
+        "version": 1,
+        "key": "bitaxe.frequency.aabbccddee01",
+        "data": {"baseline": 500, "limits": {"power_budget": 450}},
+    }
+    fake_device.info.update(frequency=450, power=18.0)
+    entry = make_entry(fake_device.host, fake_device.info["macAddr"])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    controller = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+    await _evaluate(hass, controller, 100)
+
+    assert fake_device.settings == [{"frequency": 500}]
+
+
+async def test_limits_are_saved(
+    hass: HomeAssistant, hass_storage, freezer, devices: list[FakeBitaxe]
+) -> None:
+    """Test the baseline and the limits are written to storage."""
+    controller = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+
+    await _evaluate(hass, controller, 38)
+    freezer.tick(FREQUENCY_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass_storage["bitaxe.frequency.aabbccddee01"]["data"] == {
+        "baseline": 500,
+        "limits": {"power_budget": 450},
+    }
@@ -0,0 +1,119 @@
+"""Tests for Bitaxe host re-resolution."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.bitaxe.const import DOMAIN, RESOLVE_INTERVAL
+
+from .conftest import FakeBitaxe, FakeFleet
+
+
+async def _fail_until_resolved(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Poll an unreachable device until the background lookup has finished."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    for _ in range(3):
+        await coordinator.async_refresh()
+    await _wait_for_lookup(hass)
+
+
+async def _wait_for_lookup(hass: HomeAssistant) -> None:
+    """Wait for the background lookup to finish."""
+    for task in list(hass._background_tasks):
+        await task
+    await hass.async_block_till_done()
+
+
+async def test_device_found_on_subnet(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_fleet: FakeFleet,
+    fake_device: FakeBitaxe,
+) -> None:
+    """Test a device that moved within its subnet is followed by MAC."""
+    fake_fleet.add("192.168.1.60", mac="AA:BB:CC:DD:EE:99")
+    fake_fleet.move(fake_device.host, "192.168.1.77")
+
+    with patch(
+        "custom_components.bitaxe.resolver._async_lookup_hostname", return_value=[]
+    ):
+        await _fail_until_resolved(hass, init_integration)
+
+    assert init_integration.data[CONF_HOST] == "192.168.1.77"
+    assert init_integration.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    assert coordinator.api.host == "192.168.1.77"
+    assert coordinator.data["hashRate"] == 500.0
+
+
+async def test_device_found_by_hostname(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_fleet: FakeFleet,
+    fake_device: FakeBitaxe,
+) -> None:
+    """Test the mDNS hostname is tried before the subnet probe."""
+    fake_fleet.move(fake_device.host, "10.1.2.3")
+
+    with patch(
+        "custom_components.bitaxe.resolver._async_lookup_hostname",
+        return_value=["10.1.2.3"],
+    ) as lookup:
+        await _fail_until_resolved(hass, init_integration)
+
+    lookup.assert_called_once_with(hass, "bitaxe")
+    assert init_integration.data[CONF_HOST] == "10.1.2.3"
+
+
+async def test_device_not_found(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_device: FakeBitaxe,
+) -> None:
+    """Test the entry is left alone when the MAC does not answer anywhere."""
+    fake_device.error = TimeoutError()
+
+    with patch(
+        "custom_components.bitaxe.resolver._async_lookup_hostname", return_value=[]
+    ):
+        await _fail_until_resolved(hass, init_integration)
+
+    assert init_integration.data[CONF_HOST] == fake_device.host
+
+
+async def test_lookup_retried_while_unreachable(
+    hass: HomeAssistant,
+    freezer,
+    init_integration: MockConfigEntry,
+    fake_fleet: FakeFleet,
+    fake_device: FakeBitaxe,
+) -> None:
+    """Test the lookup is retried until the device shows up on a new address."""
+    fake_device.error = TimeoutError()
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    with patch(
+        "custom_components.bitaxe.resolver._async_lookup_hostname", return_value=[]
+    ) as lookup:
+        await _fail_until_resolved(hass, init_integration)
+        assert init_integration.data[CONF_HOST] == fake_device.host
+
+        # Polls keep failing, and the coordinator no longer notifies listeners
+        for _ in range(2):
+            await coordinator.async_refresh()
+        fake_fleet.move(fake_device.host, "192.168.1.77")
+
+        freezer.tick(RESOLVE_INTERVAL)
+        async_fire_time_changed(hass)
+        await _wait_for_lookup(hass)
+
+    assert lookup.call_count == 2
+    assert init_integration.data[CONF_HOST] == "192.168.1.77"
@@ -0,0 +1,113 @@
+"""Fleet-scale performance scenario for the Bitaxe integration."""
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+
+import pytest
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.bitaxe.const import CONF_MONITORING_ONLY, DOMAIN
+
+from .conftest import FakeFleet, make_entry
+
+FLEET_SIZE = 1000
+STEADY_STATE_POLLS = 4
+SCAN_INTERVAL = 15
+
+# Timings use process CPU time: the freezer fixture patches the wall clocks,
+# and with an in-process fake fleet every busy second is CPU spent on the loop.
+# Limits carry generous headroom over the measured values so that only real
+# regressions trip them, not a slow CI runner.
+MAX_SETUP_SECONDS = 120
+MAX_LOOP_UTILIZATION = 0.5
+MAX_BYTES_PER_DEVICE = 1_000_000
+
+
+PROFILES = pytest.mark.parametrize(
+    "monitoring_only", [False, True], ids=["full", "monitoring_only"]
+)
+
+
+def _add_fleet(hass: HomeAssistant, fake_fleet: FakeFleet, monitoring_only: bool) -> None:
+    """Add a config entry and a fake device for every member of the fleet."""
+    for index in range(FLEET_SIZE):
+        host = f"10.0.{index // 250}.{index % 250 + 1}"
+        mac = f"AA:BB:CC:00:{index // 256:02X}:{index % 256:02X}"
+        fake_fleet.add(host, mac)
+        make_entry(host, mac, {CONF_MONITORING_ONLY: monitoring_only}).add_to_hass(hass)
+
+
+async def _setup_fleet(hass: HomeAssistant) -> None:
+    """Set up the integration and check every entry loaded."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    assert len(hass.config_entries.async_entries(DOMAIN)) == FLEET_SIZE
+    assert all(
+        entry.state is ConfigEntryState.LOADED
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+
+
+async def _loop_utilization(hass: HomeAssistant, freezer) -> float:
+    """Return the share of simulated wall time the event loop spends polling."""
+    busy = 0.0
+    for _ in range(STEADY_STATE_POLLS):
+        freezer.tick(SCAN_INTERVAL)
+        start = time.process_time()
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        busy += time.process_time() - start
+    return busy / (STEADY_STATE_POLLS * SCAN_INTERVAL)
+
+
+@pytest.mark.scale
+@PROFILES
+async def test_fleet_setup_and_polling(
+    hass: HomeAssistant, fake_fleet: FakeFleet, freezer, monitoring_only: bool
+) -> None:
+    """Test setup time and steady-state loop utilization for a large fleet."""
+    _add_fleet(hass, fake_fleet, monitoring_only)
+
+    start = time.process_time()
+    await _setup_fleet(hass)
+    setup_time = time.process_time() - start
+
+    utilization = await _loop_utilization(hass, freezer)
+
+    print(
+        f"\n{FLEET_SIZE} devices: {len(hass.states.async_all())} entities, "
+        f"setup {setup_time:.1f} s, loop utilization {utilization:.1%}"
+    )
+    assert setup_time < MAX_SETUP_SECONDS
+    assert utilization < MAX_LOOP_UTILIZATION
+
+
+@pytest.mark.scale
+@PROFILES
+async def test_fleet_memory(
+    hass: HomeAssistant, fake_fleet: FakeFleet, monitoring_only: bool
+) -> None:
+    """Test the memory held per device once a large fleet is set up.
+
+    Kept apart from the timing scenario because tracemalloc slows setup
+    several times over.
+    """
+    _add_fleet(hass, fake_fleet, monitoring_only)
+
+    gc.collect()
+    tracemalloc.start()
+    await _setup_fleet(hass)
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\n{FLEET_SIZE} devices: {memory // FLEET_SIZE / 1024:.0f} KiB per device")
+    assert memory // FLEET_SIZE < MAX_BYTES_PER_DEVICE
@@ -0,0 +1,205 @@
+"""Tests for the Bitaxe per-device request scheduler."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.bitaxe.const import (
+    PRIORITY_CONTROL,
+    PRIORITY_POLL,
+    PRIORITY_USER,
+)
+from custom_components.bitaxe.scheduler import RequestScheduler
+
+
+async def test_concurrency_and_priority() -> None:
+    """Test requests run a slot at a time, user writes first."""
+    scheduler = RequestScheduler(max_parallel=1)
+    release = asyncio.Event()
+    running = 0
+    order: list[str] = []
+
+    async def _request(name: str) -> str:
+        nonlocal running
+        running += 1
+        assert running == 1
+        order.append(name)
+        await release.wait()
+        running -= 1
+        return name
+
+    tasks = [
+        asyncio.create_task(scheduler.run(PRIORITY_POLL, lambda: _request("first"))),
+    ]
+    await asyncio.sleep(0)
+    for name, priority in (
+        ("poll", PRIORITY_POLL),
+        ("control", PRIORITY_CONTROL),
+        ("user", PRIORITY_USER),
+    ):
+        tasks.append(
+            asyncio.create_task(
+                scheduler.run(priority, lambda name=name: _request(name))
+            )
+        )
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert order == ["first", "user", "control", "poll"]
+    assert results[0] == ("first", 0.0)
+    assert all(waited >= 0 for _, waited in results)
+
+
+async def test_waiting_reads_are_collapsed() -> None:
+    """Test identical reads share one request while they wait for a slot."""
+    scheduler = RequestScheduler(max_parallel=1)
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def _read(path: str) -> str:
+        calls.append(path)
+        await release.wait()
+        return path
+
+    # The first read is sent right away, so the next one is not shared with it
+    tasks = [
+        asyncio.create_task(scheduler.read(path, PRIORITY_POLL, lambda path=path: _read(path)))
+        for path in ("/info", "/info", "/info", "/asic")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == ["/info", "/info", "/asic"]
+    assert [result for result, _ in results] == ["/info", "/info", "/info", "/asic"]
+
+
+async def test_joining_read_raises_priority() -> None:
+    """Test a more urgent read moves the waiting read it joins up the queue."""
+    scheduler = RequestScheduler(max_parallel=1)
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def _request(name: str) -> str:
+        order.append(name)
+        await release.wait()
+        return name
+
+    tasks = [
+        asyncio.create_task(scheduler.run(PRIORITY_POLL, lambda: _request("first"))),
+    ]
+    await asyncio.sleep(0)
+    tasks.append(
+        asyncio.create_task(
+            scheduler.read("/info", PRIORITY_POLL, lambda: _request("/info"))
+        )
+    )
+    tasks.append(
+        asyncio.create_task(
+            scheduler.run(PRIORITY_CONTROL, lambda: _request("control"))
+        )
+    )
+    await asyncio.sleep(0)
+    tasks.append(
+        asyncio.create_task(
+            scheduler.read("/info", PRIORITY_USER, lambda: _request("unused"))
+        )
+    )
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert order == ["first", "/info", "control"]
+    assert results[3][0] == "/info"
+
+
+async def test_collapsed_read_errors_and_slot_release() -> None:
+    """Test a failed read fails every reader that joined it and frees its slot."""
+    scheduler = RequestScheduler(max_parallel=1)
+    release = asyncio.Event()
+
+    async def _blocker() -> None:
+        await release.wait()
+
+    async def _fail() -> None:
+        raise TimeoutError
+
+    blocker = asyncio.create_task(scheduler.run(PRIORITY_POLL, _blocker))
+    await asyncio.sleep(0)
+    readers = [
+        asyncio.create_task(scheduler.read("/info", PRIORITY_POLL, _fail))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await blocker
+    for reader in readers:
+        with pytest.raises(TimeoutError):
+            await reader
+
+    async def _ok() -> str:
+        return "ok"
+
+    assert (await scheduler.run(PRIORITY_USER, _ok))[0] == "ok"
+
+
+async def test_joined_read_survives_cancelled_owner() -> None:
+    """Test readers that joined a read are not cancelled with its owner."""
+    scheduler = RequestScheduler(max_parallel=1)
+    release = asyncio.Event()
+    requests = 0
+
+    async def _blocker() -> None:
+        await release.wait()
+
+    async def _read() -> str:
+        nonlocal requests
+        requests += 1
+        return "info"
+
+    blocker = asyncio.create_task(scheduler.run(PRIORITY_POLL, _blocker))
+    await asyncio.sleep(0)
+    owner = asyncio.create_task(scheduler.read("/info", PRIORITY_POLL, _read))
+    await asyncio.sleep(0)
+    joiners = [
+        asyncio.create_task(scheduler.read("/info", PRIORITY_CONTROL, _read))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    owner.cancel()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    release.set()
+    await blocker
+
+    assert [(await joiner)[0] for joiner in joiners] == ["info", "info"]
+    assert owner.cancelled()
+    # The joiners collapsed again onto a single read
+    assert requests == 1
+
+
+async def test_cancelled_waiter_skipped() -> None:
+    """Test a request cancelled while waiting does not take a slot."""
+    scheduler = RequestScheduler(max_parallel=1)
+    release = asyncio.Event()
+
+    async def _blocker() -> None:
+        await release.wait()
+
+    async def _ok() -> str:
+        return "ok"
+
+    blocker = asyncio.create_task(scheduler.run(PRIORITY_POLL, _blocker))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(scheduler.run(PRIORITY_USER, _ok))
+    waiting = asyncio.create_task(scheduler.run(PRIORITY_POLL, _ok))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+    await blocker
+
+    assert (await waiting)[0] == "ok"
+    assert cancelled.cancelled()
+    assert (await scheduler.run(PRIORITY_POLL, _ok))[0] == "ok"
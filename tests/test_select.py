@@ -0,0 +1,32 @@
+"""Tests for the Bitaxe select platform."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components.select import (
+    ATTR_OPTION,
+    DOMAIN as SELECT_DOMAIN,
+    SERVICE_SELECT_OPTION,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeBitaxe, get_entity_id
+
+
+async def test_select(hass: HomeAssistant, init_integration, fake_device: FakeBitaxe) -> None:
+    """Test the rotation select reflects and changes the device setting."""
+    entity_id = get_entity_id(hass, "select", "rotation")
+    assert hass.states.get(entity_id).state == "0°"
+
+    with patch("custom_components.bitaxe.select.asyncio.sleep"):
+        await hass.services.async_call(
+            SELECT_DOMAIN,
+            SERVICE_SELECT_OPTION,
+            {ATTR_ENTITY_ID: entity_id, ATTR_OPTION: "180°"},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    assert fake_device.settings[-1] == {"rotation": 180}
+    assert hass.states.get(entity_id).state == "180°"
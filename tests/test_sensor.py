@@ -0,0 +1,68 @@
+"""Tests for the Bitaxe sensor platform."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeBitaxe, get_entity_id
+
+
+async def test_sensors(hass: HomeAssistant, init_integration) -> None:
+    """Test sensor states reflect the device."""
+    assert hass.states.get(get_entity_id(hass, "sensor", "hashRate")).state == "500.0"
+    assert hass.states.get(get_entity_id(hass, "sensor", "temp")).state == "55.5"
+    assert hass.states.get(get_entity_id(hass, "sensor", "power")).state == "12.5"
+    assert hass.states.get(get_entity_id(hass, "sensor", "energy")).state == "0.0"
+    assert hass.states.get(get_entity_id(hass, "sensor", "efficiency")).state == "25.25"
+
+
+async def test_difficulty_sensor_parses_suffix(
+    hass: HomeAssistant, init_integration
+) -> None:
+    """Test string difficulties with a suffix are converted to numbers."""
+    state = hass.states.get(get_entity_id(hass, "sensor", "bestDiff"))
+    assert float(state.state) == 39.2e9
+
+
+async def test_pool_sensor(hass: HomeAssistant, init_integration) -> None:
+    """Test the pool sensor shows the active pool."""
+    state = hass.states.get(get_entity_id(hass, "sensor", "pool"))
+    assert state.state == "primary"
+    assert state.attributes["url"] == "public-pool.io:21496"
+    assert state.attributes["user"] == "bc1qexample.bitaxe"
+
+
+async def test_sensors_unavailable_after_failures(
+    hass: HomeAssistant, init_integration, fake_device: FakeBitaxe, freezer
+) -> None:
+    """Test sensors go unavailable once the device keeps failing."""
+    entity_id = get_entity_id(hass, "sensor", "hashRate")
+    fake_device.error = TimeoutError()
+
+    for _ in range(4):
+        freezer.tick(15)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+
+async def test_expected_hashrate_sensors(
+    hass: HomeAssistant, init_integration, fake_device: FakeBitaxe, freezer
+) -> None:
+    """Test the expected hashrate follows frequency and core counts."""
+    # 500 MHz x 894 small cores x 1 chip
+    expected = get_entity_id(hass, "sensor", "expectedHashrate")
+    efficiency = get_entity_id(hass, "sensor", "hashrateEfficiency")
+    assert hass.states.get(expected).state == "447.0"
+    assert hass.states.get(efficiency).state == "110.7"
+
+    # Older firmware without core counts falls back to the model table
+    fake_device.info["frequency"] = 450
+    del fake_device.info["smallCoreCount"]
+    freezer.tick(15)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(expected).state == "402.3"
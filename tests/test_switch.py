@@ -0,0 +1,41 @@
+"""Tests for the Bitaxe switch platform."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeBitaxe, get_entity_id
+
+
+async def test_switch(
+    hass: HomeAssistant, init_integration, fake_device: FakeBitaxe, freezer
+) -> None:
+    """Test switches reflect and change device settings."""
+    entity_id = get_entity_id(hass, "switch", "overclockEnabled")
+    assert hass.states.get(entity_id).state == "off"
+
+    with patch("custom_components.bitaxe.switch.asyncio.sleep"):
+        await hass.services.async_call(
+            SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
+        )
+        await hass.async_block_till_done()
+    assert fake_device.settings[-1] == {"overclockEnabled": 1}
+    assert hass.states.get(entity_id).state == "on"
+
+    with patch("custom_components.bitaxe.switch.asyncio.sleep"):
+        await hass.services.async_call(
+            SWITCH_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: entity_id}, blocking=True
+        )
+        await hass.async_block_till_done()
+    assert fake_device.settings[-1] == {"overclockEnabled": 0}
+
+    # Refresh requests are debounced, let the cooldown pass
+    freezer.tick(11)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "off"
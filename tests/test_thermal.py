@@ -0,0 +1,170 @@
+"""Tests for the Bitaxe thermal controller."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bitaxe.const import (
+    CONF_THERMAL_CONTROL,
+    DATA_FREQUENCY_LIMITS,
+    DOMAIN,
+)
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+from custom_components.bitaxe.power_budget import BitaxePowerBudgetController
+from custom_components.bitaxe.thermal import BitaxeThermalController
+
+from .conftest import FakeBitaxe
+
+BUDGET_ENTITY = "input_number.bitaxe_budget"
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant):
+    """Return the coordinator of a polled fake device drawing 20 W."""
+    device = FakeBitaxe("192.168.1.50")
+    device.info["power"] = 20.0
+    coordinator = BitaxeDataUpdateCoordinator(hass, device, "Bitaxe", 15)
+    await coordinator.async_refresh()
+    hass.data.setdefault(DOMAIN, {})["entry"] = coordinator
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+def _frequencies(device: FakeBitaxe) -> list[int]:
+    """Return the frequencies written to a device."""
+    return [
+        settings["frequency"] for settings in device.settings if "frequency" in settings
+    ]
+
+
+async def _step(hass: HomeAssistant, thermal: BitaxeThermalController) -> None:
+    """Run one control step and the refresh it requested."""
+    await thermal._async_step()
+    await hass.async_block_till_done()
+
+
+async def test_fan_follows_temperature(
+    hass: HomeAssistant, coordinator: BitaxeDataUpdateCoordinator
+) -> None:
+    """Test the controller takes over the fan and speeds it up when hot."""
+    device = coordinator.api
+    thermal = BitaxeThermalController(hass, coordinator, 60, 70, 3)
+
+    device.info["temp"] = 66
+    await _step(hass, thermal)
+
+    assert device.settings[0] == {"autofanspeed": 0}
+    assert device.settings[1]["fanspeed"] > 60
+    assert _frequencies(device) == []
+
+    thermal.async_stop()
+    await hass.async_block_till_done()
+    assert device.settings[-1] == {"autofanspeed": 1}
+
+
+async def test_frequency_fallback_and_restore(
+    hass: HomeAssistant, freezer, coordinator: BitaxeDataUpdateCoordinator
+) -> None:
+    """Test frequency steps down with the fan saturated, then back to the baseline."""
+    device = coordinator.api
+    thermal = BitaxeThermalController(hass, coordinator, 60, 70, 3)
+
+    device.info.update(temp=75, fanspeed=100)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475]
+
+    # Frequency writes are rate limited
+    freezer.tick(3)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475]
+
+    freezer.tick(60)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475, 450]
+
+    device.info.update(temp=50, fanspeed=40)
+    for _ in range(3):
+        freezer.tick(60)
+        await _step(hass, thermal)
+    assert _frequencies(device) == [475, 450, 475, 500]
+
+
+async def test_shares_the_baseline_with_the_power_budget(
+    hass: HomeAssistant, freezer, coordinator: BitaxeDataUpdateCoordinator
+) -> None:
+    """Test neither controller takes the other's throttled frequency as baseline."""
+    device = coordinator.api
+    thermal = BitaxeThermalController(hass, coordinator, 60, 70, 3)
+    budget = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+
+    hass.states.async_set(BUDGET_ENTITY, "19")
+    await budget._async_evaluate()
+    await hass.async_block_till_done()
+    assert _frequencies(device) == [475]
+
+    # Cool, but the power budget holds the frequency down
+    device.info.update(temp=50, fanspeed=40)
+    freezer.tick(60)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475]
+
+    device.info.update(temp=75, fanspeed=100, power=19.0)
+    freezer.tick(60)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475, 450]
+
+    # Budget lifted while thermal control still holds the device lower
+    hass.states.async_set(BUDGET_ENTITY, "100")
+    freezer.tick(60)
+    await budget._async_evaluate()
+    await hass.async_block_till_done()
+    assert _frequencies(device) == [475, 450]
+
+    device.info.update(temp=50, fanspeed=40)
+    for _ in range(3):
+        freezer.tick(60)
+        await _step(hass, thermal)
+    assert _frequencies(device) == [475, 450, 475, 500]
+
+
+async def test_stop_while_throttled_restores_frequency(
+    hass: HomeAssistant, freezer, coordinator: BitaxeDataUpdateCoordinator
+) -> None:
+    """Test disabling thermal control lifts its frequency limit."""
+    device = coordinator.api
+    thermal = BitaxeThermalController(hass, coordinator, 60, 70, 3)
+
+    device.info.update(temp=75, fanspeed=100)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475]
+
+    thermal.async_stop()
+    await hass.async_block_till_done()
+
+    assert device.settings[-2:] == [{"autofanspeed": 1}, {"frequency": 500}]
+    limits = hass.data[DOMAIN][DATA_FREQUENCY_LIMITS][device.info["macAddr"]]
+    assert limits.limit(CONF_THERMAL_CONTROL) is None
+    assert limits.target == 500
+
+
+async def test_stop_keeps_power_budget_limit(
+    hass: HomeAssistant, freezer, coordinator: BitaxeDataUpdateCoordinator
+) -> None:
+    """Test disabling thermal control only lifts the frequency to the budget's limit."""
+    device = coordinator.api
+    thermal = BitaxeThermalController(hass, coordinator, 60, 70, 3)
+    budget = BitaxePowerBudgetController(hass, BUDGET_ENTITY, 5)
+
+    hass.states.async_set(BUDGET_ENTITY, "19")
+    await budget._async_evaluate()
+    await hass.async_block_till_done()
+    device.info.update(temp=75, fanspeed=100, power=19.0)
+    freezer.tick(60)
+    await _step(hass, thermal)
+    assert _frequencies(device) == [475, 450]
+
+    thermal.async_stop()
+    await hass.async_block_till_done()
+
+    assert _frequencies(device) == [475, 450, 475]
@@ -0,0 +1,17 @@
+"""Tests for the Bitaxe update platform."""
+from __future__ import annotations
+
+from homeassistant.const import STATE_OFF
+from homeassistant.core import HomeAssistant
+
+from .conftest import get_entity_id
+
+
+async def test_update_without_staged_firmware(
+    hass: HomeAssistant, init_integration
+) -> None:
+    """Test the update entity reports no update when nothing is staged."""
+    state = hass.states.get(get_entity_id(hass, "update", "firmware"))
+    assert state.state == STATE_OFF
+    assert state.attributes["installed_version"] == "v2.4.0"
+    assert state.attributes["latest_version"] == "v2.4.0"
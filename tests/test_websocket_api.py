@@ -0,0 +1,133 @@
+"""Tests for the Bitaxe websocket API."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.bitaxe.const import DOMAIN
+
+from .conftest import FakeBitaxe
+
+
+async def test_history(
+    hass: HomeAssistant,
+    hass_ws_client,
+    init_integration: MockConfigEntry,
+    fake_device: FakeBitaxe,
+    freezer,
+) -> None:
+    """Test the history command returns the downsampled ring samples."""
+    for temp in (56, 57, 58):
+        fake_device.info["temp"] = temp
+        freezer.tick(15)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, fake_device.info["macAddr"])}
+    )
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": "bitaxe/history",
+            "device_id": device.id,
+            "hours": 0.01,  # 36 seconds, the last three polls
+            "points": 2,
+        }
+    )
+    response = await client.receive_json()
+
+    assert response["success"]
+    result = response["result"]
+    assert result["fields"] == ["timestamp", "hashRate", "temp", "vrTemp", "power"]
+    assert [point[2] for point in result["points"]] == [56.0, 57.5]
+    assert all(point[1] == 500.0 for point in result["points"])
+
+
+async def test_history_unknown_device(
+    hass: HomeAssistant, hass_ws_client, init_integration: MockConfigEntry
+) -> None:
+    """Test an unknown device returns an error."""
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "bitaxe/history", "device_id": "missing"})
+    response = await client.receive_json()
+
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_fleet(
+    hass: HomeAssistant,
+    hass_ws_client,
+    init_integration: MockConfigEntry,
+    fake_device: FakeBitaxe,
+) -> None:
+    """Test the fleet command returns every device's snapshot."""
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, fake_device.info["macAddr"])}
+    )
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "bitaxe/fleet"})
+    response = await client.receive_json()
+
+    assert response["success"]
+    result = response["result"]
+    snapshot = result["devices"][device.id]
+    assert snapshot["name"] == "Bitaxe 192.168.1.50"
+    assert snapshot["mac"] == "AA:BB:CC:DD:EE:01"
+    assert snapshot["available"] is True
+    values = dict(zip(result["fields"], snapshot["values"]))
+    assert values["hashRate"] == 500.0
+    assert values["bestDiff"] == 39.2e9
+    assert values["pool"] == "primary"
+
+
+async def test_fleet_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client,
+    init_integration: MockConfigEntry,
+    fake_device: FakeBitaxe,
+    freezer,
+) -> None:
+    """Test the fleet subscription pushes only the changed fields."""
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, fake_device.info["macAddr"])}
+    )
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "bitaxe/fleet/subscribe"})
+    response = await client.receive_json()
+    assert response["success"]
+    event = (await client.receive_json())["event"]
+    assert list(event["added"]) == [device.id]
+
+    async def _poll() -> None:
+        freezer.tick(15)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        freezer.tick(1)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    fake_device.info["temp"] = 61.5
+    await _poll()
+    event = (await client.receive_json())["event"]
+    assert event == {"added": {}, "changed": {device.id: {"temp": 61.5}}, "removed": []}
+
+    # A poll without changes sends nothing, a failing device only its availability
+    await _poll()
+    fake_device.error = TimeoutError()
+    await _poll()
+    event = (await client.receive_json())["event"]
+    changes = event["changed"][device.id]
+    assert changes["available"] is False
+    assert changes["temp"] is None
+
+    await client.send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": response["id"]}
+    )
+    assert (await client.receive_json())["success"]